@@ -1,11 +1,24 @@
 """
 LexiQ Agents Module
 Contains specialized AI agents for different legal research tasks.
+
+Agents are imported on first access so that importing one agent does not
+load the dependencies of the others.
 """
 
-from .news_relevance_agent import NewsRelevanceAgent
-from .statute_reference_agent import StatuteReferenceAgent
-from .bench_bias_agent import BenchBiasAgent
+import importlib
+
+_AGENT_MODULES = {
+    'NewsRelevanceAgent': '.news_relevance_agent',
+    'StatuteReferenceAgent': '.statute_reference_agent',
+    'BenchBiasAgent': '.bench_bias_agent',
+}
 
 __all__ = ['NewsRelevanceAgent', 'StatuteReferenceAgent', 'BenchBiasAgent']
 
+
+def __getattr__(name):
+    if name in _AGENT_MODULES:
+        module = importlib.import_module(_AGENT_MODULES[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -7,6 +7,7 @@ and topics, then using Claude to provide legal-context-aware summaries.
 
 from typing import Dict, List, Any, Optional
 import re
+from concurrent.futures import ThreadPoolExecutor
 from gnews import GNews
 from aws.bedrock_client import call_claude, BedrockClient
 
@@ -41,6 +42,10 @@ CASE TEXT:
 """
 
 
+# Upper bound on concurrent GNews requests per search
+MAX_SEARCH_WORKERS = 8
+
+
 # News Analysis Prompt
 NEWS_ANALYSIS_PROMPT = """You are a legal news analyst.
 
@@ -174,30 +179,29 @@ class NewsRelevanceAgent:
         
         print(f"📰 Searching news with {len(keywords)} keyword(s)...")
         
-        for keyword in keywords[:3]:  # Limit to top 3 keywords to avoid overwhelming results
-            try:
-                print(f"   Searching: {keyword}")
-                articles = self.google_news.get_news(keyword)
-                
-                for article in articles:
-                    url = article.get('url', '')
-                    if url and url not in seen_urls:
-                        seen_urls.add(url)
-                        all_articles.append({
-                            'title': article.get('title', 'No title'),
-                            'description': article.get('description', 'No description'),
-                            'url': url,
-                            'published_date': article.get('published date', 'Unknown'),
-                            'publisher': article.get('publisher', {}).get('title', 'Unknown'),
-                            'keyword': keyword
-                        })
-                        
-                        if len(all_articles) >= self.max_results:
-                            break
-                            
-            except Exception as e:
-                print(f"⚠️  Error searching for '{keyword}': {e}")
-                continue
+        search_keywords = keywords[:3]  # Limit to top 3 keywords to avoid overwhelming results
+        
+        # Searches are network-bound, so run them concurrently and merge in keyword order
+        max_workers = max(1, min(MAX_SEARCH_WORKERS, len(search_keywords)))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            keyword_results = list(executor.map(self._search_keyword, search_keywords))
+        
+        for keyword, articles in zip(search_keywords, keyword_results):
+            for article in articles:
+                url = article.get('url', '')
+                if url and url not in seen_urls:
+                    seen_urls.add(url)
+                    all_articles.append({
+                        'title': article.get('title', 'No title'),
+                        'description': article.get('description', 'No description'),
+                        'url': url,
+                        'published_date': article.get('published date', 'Unknown'),
+                        'publisher': article.get('publisher', {}).get('title', 'Unknown'),
+                        'keyword': keyword
+                    })
+                    
+                    if len(all_articles) >= self.max_results:
+                        break
             
             if len(all_articles) >= self.max_results:
                 break
@@ -205,6 +209,15 @@ class NewsRelevanceAgent:
         print(f"✓ Found {len(all_articles)} relevant articles")
         return all_articles[:self.max_results]
     
+    def _search_keyword(self, keyword: str) -> List[Dict[str, Any]]:
+        """Fetch raw GNews results for one keyword, returning [] on failure."""
+        try:
+            print(f"   Searching: {keyword}")
+            return self.google_news.get_news(keyword)
+        except Exception as e:
+            print(f"⚠️  Error searching for '{keyword}': {e}")
+            return []
+    
     def analyze_news_relevance(self, 
                                case_text: str, 
                                articles: List[Dict[str, Any]],
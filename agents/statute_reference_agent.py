@@ -76,6 +76,12 @@ class StatuteReferenceAgent:
         ],
     }
     
+    # Compiled once at import so extraction doesn't recompile per call
+    COMPILED_PATTERNS = {
+        provision_type: [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
+        for provision_type, patterns in PATTERNS.items()
+    }
+    
     # Known acts and their full names
     ACT_NAMES = {
         'ipc': 'Indian Penal Code, 1860',
@@ -103,10 +109,10 @@ class StatuteReferenceAgent:
         """
         provisions = {}
         
-        for provision_type, patterns in self.PATTERNS.items():
+        for provision_type, patterns in self.COMPILED_PATTERNS.items():
             found = set()
             for pattern in patterns:
-                matches = re.finditer(pattern, text, re.IGNORECASE)
+                matches = pattern.finditer(text)
                 for match in matches:
                     # Extract the number/reference
                     ref = match.group(1).strip()
@@ -248,14 +254,14 @@ class StatuteReferenceAgent:
         Returns:
             List of extracted references
         """
-        if act_type not in self.PATTERNS:
+        if act_type not in self.COMPILED_PATTERNS:
             return []
         
         found = set()
-        patterns = self.PATTERNS[act_type]
+        patterns = self.COMPILED_PATTERNS[act_type]
         
         for pattern in patterns:
-            matches = re.finditer(pattern, case_text, re.IGNORECASE)
+            matches = pattern.finditer(case_text)
             for match in matches:
                 found.add(match.group(1).strip())
         
@@ -6,11 +6,14 @@ Handles JWT token creation, validation, and management for API authentication
 
 import jwt
 import os
+import time
 from datetime import datetime, timedelta
 from typing import Dict, Any, Optional
 from functools import wraps
 from flask import request, jsonify
 
+from utils.query_cache import QueryCache
+
 
 class JWTManager:
     """
@@ -18,6 +21,9 @@ class JWTManager:
     Works with Cognito tokens or custom JWT tokens.
     """
     
+    # Maximum number of verified tokens kept in the decode cache
+    DECODE_CACHE_MAX_ENTRIES = 1024
+    
     def __init__(self, secret_key: Optional[str] = None, algorithm: str = 'HS256'):
         """
         Initialize JWT manager.
@@ -30,6 +36,11 @@ class JWTManager:
         self.algorithm = algorithm
         self.token_expiry = 3600  # 1 hour
         self.refresh_token_expiry = 86400 * 30  # 30 days
+        
+        # Verified tokens: (token, key, algorithm) -> (payload, exp). A token
+        # is verified (signature + claims) once; repeat requests with it only
+        # check that it has not expired since.
+        self._decode_cache = QueryCache(self.DECODE_CACHE_MAX_ENTRIES)
     
     def create_access_token(self, user_id: str, username: str, role: str = 'user') -> str:
         """
@@ -85,13 +96,39 @@ class JWTManager:
         Returns:
             Decoded payload or None if invalid
         """
+        cache_key = (token, self.secret_key, self.algorithm)
+        cached = self._decode_cache.get(cache_key)
+        if cached is not None:
+            payload, exp = cached
+            if time.time() < exp:
+                return dict(payload)
+            self._decode_cache.pop(cache_key)  # Token expired
+        
         try:
             payload = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
-            return payload
         except jwt.ExpiredSignatureError:
             return None  # Token expired
         except jwt.InvalidTokenError:
             return None  # Invalid token
+        
+        # Only tokens that expire are cached; the cache must not outlive them
+        exp = payload.get('exp')
+        if isinstance(exp, (int, float)):
+            self._decode_cache.put(cache_key, (payload, exp), ttl=exp - time.time())
+        
+        return dict(payload)
+    
+    def invalidate_token(self, token: str):
+        """
+        Drop a token from the decode cache (e.g. on logout).
+        
+        The token itself stays valid until it expires; this only forces the
+        next decode_token call to verify it again.
+        
+        Args:
+            token: JWT token string
+        """
+        self._decode_cache.pop((token, self.secret_key, self.algorithm))
     
     def verify_token(self, token: str) -> bool:
         """
@@ -3,6 +3,7 @@
 import boto3
 import json
 import os
+from typing import Iterator
 from dotenv import load_dotenv
 
 # Load AWS credentials from .env if present
@@ -12,14 +13,28 @@ load_dotenv()
 class BedrockClient:
     """Wrapper for AWS Bedrock Claude API."""
     
-    def __init__(self, region: str = None):
-        """Initialize Bedrock client."""
+    def __init__(self, region: str = None, latency_optimized: bool = True):
+        """
+        Initialize Bedrock client.
+        
+        Args:
+            region: AWS region (AWS_REGION or us-east-1 if not given)
+            latency_optimized: Request Bedrock's latency-optimized inference
+                tier, falling back to standard where it is unavailable
+        """
         self.region = region or os.getenv("AWS_REGION", "us-east-1")
         self.bedrock = boto3.client("bedrock-runtime", region_name=self.region)
+        self.latency_optimized = latency_optimized
     
     def invoke_model(self, prompt: str, max_tokens: int = 800, temperature: float = 0.3, timeout: int = 120) -> str:
         """Call Claude via Bedrock with timeout configuration."""
-        return call_claude(prompt, max_tokens, temperature, timeout)
+        return call_claude(prompt, max_tokens, temperature, timeout,
+                           latency_optimized=self.latency_optimized)
+    
+    def invoke_model_stream(self, prompt: str, max_tokens: int = 800, temperature: float = 0.3) -> Iterator[str]:
+        """Call Claude via Bedrock, yielding the response text as it is generated."""
+        return stream_claude(prompt, max_tokens, temperature,
+                             latency_optimized=self.latency_optimized)
 
 
 # Initialize Bedrock client with timeout configuration
@@ -32,7 +47,63 @@ bedrock = boto3.client(
     )
 )
 
-def call_claude(prompt: str, max_tokens: int = 800, temperature: float = 0.3, timeout: int = 120) -> str:
+# Claude 3 Sonnet via Bedrock
+# Option 1: Claude 3 Sonnet (stable, recommended)
+CLAUDE_MODEL_ID = "anthropic.claude-3-sonnet-20240229-v1:0"
+
+# Option 2: Claude Sonnet 4 (if you have access to inference profiles)
+# CLAUDE_MODEL_ID = "us.anthropic.claude-sonnet-4-5-20250929-v1:0"  # US East region inference profile
+# CLAUDE_MODEL_ID = "anthropic.claude-sonnet-4-5-20250929-v1:0"     # Alternative inference profile
+
+# Models Bedrock rejected latency-optimized requests for (model or region
+# without that tier); they are called with standard latency from then on
+_latency_optimized_unsupported = set()
+
+
+def _claude_request(prompt: str, max_tokens: int, temperature: float) -> dict:
+    """Build InvokeModel arguments for a single-turn Claude message."""
+    # Format Claude-style message prompt
+    claude_input = {
+        "messages": [{"role": "user", "content": prompt}],
+        "max_tokens": max_tokens,
+        "temperature": temperature,
+        "anthropic_version":"bedrock-2023-05-31"
+    }
+    
+    return dict(
+        modelId=CLAUDE_MODEL_ID,
+        contentType="application/json",
+        accept="application/json",
+        body=json.dumps(claude_input),
+    )
+
+
+def _invoke(operation, request: dict, latency_optimized: bool):
+    """
+    Run a Bedrock invoke operation, latency-optimized when requested and available.
+    
+    Parameters:
+        operation: bedrock.invoke_model or bedrock.invoke_model_with_response_stream
+        request (dict): Operation arguments (see _claude_request)
+        latency_optimized (bool): Try the latency-optimized tier first
+
+    Returns:
+        The operation's response
+    """
+    model_id = request["modelId"]
+    if not latency_optimized or model_id in _latency_optimized_unsupported:
+        return operation(**request)
+    
+    try:
+        return operation(performanceConfigLatency="optimized", **request)
+    except bedrock.exceptions.ValidationException as e:
+        print(f"⚠️ Latency-optimized inference unavailable for {model_id}, using standard: {e}")
+        _latency_optimized_unsupported.add(model_id)
+        return operation(**request)
+
+
+def call_claude(prompt: str, max_tokens: int = 800, temperature: float = 0.3, timeout: int = 120,
+                latency_optimized: bool = True) -> str:
     """
     Calls Claude 3 Sonnet via Amazon Bedrock.
     
@@ -40,34 +111,16 @@ def call_claude(prompt: str, max_tokens: int = 800, temperature: float = 0.3, ti
         prompt (str): Prompt to send to Claude
         max_tokens (int): Max tokens to generate
         temperature (float): Sampling temperature
+        latency_optimized (bool): Request the latency-optimized inference
+            tier, falling back to standard if the model/region lacks it
 
     Returns:
         str: Claude's response text
     """
 
-    # Format Claude-style message prompt
-    claude_input = {
-        "messages": [{"role": "user", "content": prompt}],
-        "max_tokens": max_tokens,
-        "temperature": temperature,
-        "anthropic_version":"bedrock-2023-05-31"
-    }
-
-    # Claude 3 Sonnet via Bedrock
-    # Option 1: Claude 3 Sonnet (stable, recommended)
-    model_id = "anthropic.claude-3-sonnet-20240229-v1:0"
-    
-    # Option 2: Claude Sonnet 4 (if you have access to inference profiles)
-    # model_id = "us.anthropic.claude-sonnet-4-5-20250929-v1:0"  # US East region inference profile
-    # model_id = "anthropic.claude-sonnet-4-5-20250929-v1:0"     # Alternative inference profile
     try:
-        # Add timeout configuration
-        response = bedrock.invoke_model(
-            modelId=model_id,
-            contentType="application/json",
-            accept="application/json",
-            body=json.dumps(claude_input),
-        )
+        request = _claude_request(prompt, max_tokens, temperature)
+        response = _invoke(bedrock.invoke_model, request, latency_optimized)
 
         result = response["body"].read().decode("utf-8")
         result_json = json.loads(result)
@@ -76,4 +129,42 @@ def call_claude(prompt: str, max_tokens: int = 800, temperature: float = 0.3, ti
 
     except Exception as e:
         print(f"[ERROR] Claude call failed: {e}")
-        return "⚠️ Error contacting Claude via Bedrock."
\ No newline at end of file
+        return "⚠️ Error contacting Claude via Bedrock."
+
+
+def stream_claude(prompt: str, max_tokens: int = 800, temperature: float = 0.3,
+                  latency_optimized: bool = True) -> Iterator[str]:
+    """
+    Calls Claude via Amazon Bedrock, yielding the response text as it streams.
+    
+    Parameters:
+        prompt (str): Prompt to send to Claude
+        max_tokens (int): Max tokens to generate
+        temperature (float): Sampling temperature
+        latency_optimized (bool): Request the latency-optimized inference
+            tier, falling back to standard if the model/region lacks it
+
+    Yields:
+        str: Pieces of Claude's response text, in order
+
+    Raises:
+        Exception: The Bedrock error, if the call or the stream fails; text
+            already yielded is then only part of the response
+    """
+    try:
+        request = _claude_request(prompt, max_tokens, temperature)
+        response = _invoke(bedrock.invoke_model_with_response_stream, request, latency_optimized)
+        
+        for event in response["body"]:
+            chunk = event.get("chunk")
+            if not chunk:
+                continue
+            payload = json.loads(chunk["bytes"])
+            if payload.get("type") == "content_block_delta":
+                text = payload["delta"].get("text")
+                if text:
+                    yield text
+
+    except Exception as e:
+        print(f"[ERROR] Claude call failed: {e}")
+        raise
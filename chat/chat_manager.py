@@ -4,7 +4,7 @@ Chat Manager
 Orchestrates chat sessions, storage, and conversation engine
 """
 
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Iterator, Optional
 from .chat_storage import ChatStorage
 from .conversation_engine import ConversationEngine
 from aws.bedrock_client import BedrockClient
@@ -112,6 +112,62 @@ class ChatManager:
                 'error': 'Session not found'
             }
         
+        return self._respond(session_id, session, user_message, use_rag)
+    
+    def send_messages(self,
+                     session_id: str,
+                     user_messages: List[str],
+                     use_rag: bool = True) -> List[Dict[str, Any]]:
+        """
+        Send several user messages in turn and get a response to each.
+        
+        Precedents for all messages are retrieved up front in one batched
+        vector-store search. The responses are still generated one after
+        another, since each message's context includes the earlier replies.
+        
+        Args:
+            session_id: Chat session ID
+            user_messages: User's messages, in the order they are asked
+            use_rag: Whether to use RAG for precedent retrieval
+            
+        Returns:
+            List of response dictionaries (see send_message), one per message
+        """
+        # Verify session exists
+        session = self.storage.get_session(session_id)
+        if not session:
+            return [{
+                'success': False,
+                'error': 'Session not found'
+            } for _ in user_messages]
+        
+        batch_docs = self.engine.retrieve_precedents_batch(user_messages) if use_rag else None
+        
+        return [
+            self._respond(session_id, session, user_message, use_rag,
+                          precedent_docs=batch_docs[i] if batch_docs is not None else None)
+            for i, user_message in enumerate(user_messages)
+        ]
+    
+    def _respond(self,
+                session_id: str,
+                session: Dict[str, Any],
+                user_message: str,
+                use_rag: bool,
+                precedent_docs: Optional[List] = None) -> Dict[str, Any]:
+        """
+        Store a user message, generate the reply and store that too.
+        
+        Args:
+            session_id: Chat session ID
+            session: The session record
+            user_message: User's message
+            use_rag: Whether to use RAG for precedent retrieval
+            precedent_docs: Documents already retrieved for the message
+            
+        Returns:
+            Dictionary with assistant response
+        """
         # Store user message
         self.storage.add_message(
             session_id=session_id,
@@ -127,12 +183,96 @@ class ChatManager:
             user_message=user_message,
             conversation_context=context,
             initial_analysis=session.get('initial_analysis'),
-            retrieve_precedents=use_rag
+            retrieve_precedents=use_rag,
+            precedent_docs=precedent_docs
         )
         
         if not result['success']:
             return result
         
+        return self._finish_response(session_id, context, result)
+    
+    def send_message_stream(self,
+                           session_id: str,
+                           user_message: str,
+                           use_rag: bool = True) -> Iterator[Dict[str, Any]]:
+        """
+        Send a user message and stream the response as it is generated.
+        
+        Yields {'type': 'token', 'text': ...} events as the response text
+        arrives, then one {'type': 'done', ...} event carrying the same
+        fields send_message returns. The complete response is stored once
+        streaming ends. If the stream fails partway, the done event has
+        success False and the partial response is not stored.
+        
+        Args:
+            session_id: Chat session ID
+            user_message: User's message
+            use_rag: Whether to use RAG for precedent retrieval
+            
+        Yields:
+            Token events, then the final result event
+        """
+        # Verify session exists
+        session = self.storage.get_session(session_id)
+        if not session:
+            yield {
+                'type': 'done',
+                'success': False,
+                'error': 'Session not found'
+            }
+            return
+        
+        # Store user message
+        self.storage.add_message(
+            session_id=session_id,
+            role='user',
+            content=user_message
+        )
+        
+        # Get conversation context
+        context = self.storage.get_conversation_context(session_id, max_messages=10)
+        
+        # Precedents are retrieved before the first token
+        result, text_stream = self.engine.generate_response_stream(
+            user_message=user_message,
+            conversation_context=context,
+            initial_analysis=session.get('initial_analysis'),
+            retrieve_precedents=use_rag
+        )
+        
+        parts = []
+        try:
+            for text in text_stream:
+                parts.append(text)
+                yield {'type': 'token', 'text': text}
+        except Exception as e:
+            yield {
+                'type': 'done',
+                'success': False,
+                'error': str(e),
+                'message': 'Failed to generate response'
+            }
+            return
+        result['response'] = ''.join(parts)
+        
+        yield {'type': 'done', **self._finish_response(session_id, context, result)}
+    
+    def _finish_response(self,
+                        session_id: str,
+                        context: str,
+                        result: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Store a generated response and add follow-up question suggestions.
+        
+        Args:
+            session_id: Chat session ID
+            context: Conversation context the response was generated with
+            result: Successful result from the conversation engine
+            
+        Returns:
+            Dictionary with assistant response (see send_message)
+        """
         # Store assistant response
         self.storage.add_message(
             session_id=session_id,
@@ -4,7 +4,7 @@ Conversation Engine
 Chain-of-thought conversational interface with RAG integration
 """
 
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Iterator, Optional, Tuple
 from aws.bedrock_client import BedrockClient
 from utils.retriever import LegalDocumentRetriever
 from utils.s3_pdf_reader import create_s3_pdf_reader
@@ -35,7 +35,8 @@ class ConversationEngine:
                          conversation_context: str = None,
                          initial_analysis: str = None,
                          retrieve_precedents: bool = True,
-                         max_precedents: int = 3) -> Dict[str, Any]:
+                         max_precedents: int = 3,
+                         precedent_docs: Optional[List] = None) -> Dict[str, Any]:
         """
         Generate conversational response with RAG context.
         
@@ -45,15 +46,92 @@ class ConversationEngine:
             initial_analysis: Initial case analysis
             retrieve_precedents: Whether to retrieve relevant precedents
             max_precedents: Maximum precedents to retrieve
+            precedent_docs: Documents already retrieved for user_message
+                (e.g. by retrieve_precedents_batch); skips the search
             
         Returns:
             Dictionary with response and metadata
         """
+        prompt, retrieved_docs = self._prepare_response(
+            user_message, conversation_context, initial_analysis,
+            retrieve_precedents, max_precedents, precedent_docs
+        )
+        
+        # Generate response using Claude
+        try:
+            response = self.bedrock.invoke_model(prompt, max_tokens=2000)
+            
+            return {
+                'success': True,
+                'response': response,
+                **self._response_metadata(retrieved_docs, conversation_context, initial_analysis)
+            }
+            
+        except Exception as e:
+            return {
+                'success': False,
+                'error': str(e),
+                'message': 'Failed to generate response'
+            }
+    
+    def generate_response_stream(self,
+                                user_message: str,
+                                conversation_context: str = None,
+                                initial_analysis: str = None,
+                                retrieve_precedents: bool = True,
+                                max_precedents: int = 3) -> Tuple[Dict[str, Any], Iterator[str]]:
+        """
+        Generate conversational response with RAG context, streaming the text.
+        
+        Precedents are retrieved and their citations formatted before the
+        model call, so they are ready as soon as the first text arrives.
+        
+        Args:
+            user_message: User's question/message
+            conversation_context: Previous conversation history
+            initial_analysis: Initial case analysis
+            retrieve_precedents: Whether to retrieve relevant precedents
+            max_precedents: Maximum precedents to retrieve
+            
+        Returns:
+            Tuple of (metadata dictionary as in generate_response, without
+            'response'; iterator over the response text as it is generated)
+        """
+        prompt, retrieved_docs = self._prepare_response(
+            user_message, conversation_context, initial_analysis,
+            retrieve_precedents, max_precedents
+        )
+        
+        result = {
+            'success': True,
+            **self._response_metadata(retrieved_docs, conversation_context, initial_analysis)
+        }
+        return result, self.bedrock.invoke_model_stream(prompt, max_tokens=2000)
+    
+    def _prepare_response(self,
+                          user_message: str,
+                          conversation_context: Optional[str],
+                          initial_analysis: Optional[str],
+                          retrieve_precedents: bool,
+                          max_precedents: int,
+                          precedent_docs: Optional[List] = None) -> Tuple[str, List[Dict[str, Any]]]:
+        """
+        Retrieve precedents for a message and build the prompt for it.
+        
+        Args:
+            See generate_response
+            
+        Returns:
+            Tuple of (prompt, retrieved precedent info dictionaries)
+        """
         # Retrieve relevant precedents if requested
         retrieved_docs = []
         if retrieve_precedents and self.retriever:
             try:
-                docs = self.retriever.retrieve(user_message, k=max_precedents)
+                if precedent_docs is not None:
+                    docs = precedent_docs
+                else:
+                    docs = self.retriever.retrieve(user_message, k=max_precedents)
                 retrieved_docs = []
                 
                 for doc in docs:
@@ -95,31 +173,49 @@ class ConversationEngine:
             retrieved_docs=retrieved_docs
         )
         
-        # Generate response using Claude
-        try:
-            response = self.bedrock.invoke_model(prompt, max_tokens=2000)
-            
-            return {
-                'success': True,
-                'response': response,
-                'retrieved_precedents': len(retrieved_docs),
-                'precedent_citations': [
-                    f"{doc['case_title']} ({doc['citation']})" 
-                    for doc in retrieved_docs
-                ],
-                'metadata': {
-                    'model': 'claude-3-sonnet',
-                    'context_used': bool(conversation_context or initial_analysis),
-                    'rag_used': bool(retrieved_docs)
-                }
+        return prompt, retrieved_docs
+    
+    @staticmethod
+    def _response_metadata(retrieved_docs: List[Dict[str, Any]],
+                           conversation_context: Optional[str],
+                           initial_analysis: Optional[str]) -> Dict[str, Any]:
+        """Build the precedent and context fields of a response result."""
+        return {
+            'retrieved_precedents': len(retrieved_docs),
+            'precedent_citations': [
+                f"{doc['case_title']} ({doc['citation']})" 
+                for doc in retrieved_docs
+            ],
+            'metadata': {
+                'model': 'claude-3-sonnet',
+                'context_used': bool(conversation_context or initial_analysis),
+                'rag_used': bool(retrieved_docs)
             }
+        }
+    
+    def retrieve_precedents_batch(self,
+                                  user_messages: List[str],
+                                  max_precedents: int = 3) -> Optional[List[List]]:
+        """
+        Retrieve precedents for several messages in one vector-store search.
+        
+        Args:
+            user_messages: User questions/messages
+            max_precedents: Maximum precedents to retrieve per message
             
+        Returns:
+            List of Document lists (one per message, same order), or None if
+            batched retrieval is unavailable and messages should retrieve
+            individually
+        """
+        if not user_messages or not self.retriever or not hasattr(self.retriever, 'retrieve_batch'):
+            return None
+        
+        try:
+            return self.retriever.retrieve_batch(user_messages, k=max_precedents)
         except Exception as e:
-            return {
-                'success': False,
-                'error': str(e),
-                'message': 'Failed to generate response'
-            }
+            print(f"Warning: Batched precedent retrieval failed, retrieving individually: {e}")
+            return None
     
     def _build_conversational_prompt(self,
                                     user_message: str,
@@ -5,11 +5,23 @@ Runs all LexiQ agents on the same case input and aggregates results.
 """
 
 import sys
-from typing import Dict, Any
+from functools import cached_property
+from pathlib import Path
+from typing import Dict, Any, List
 from utils.case_similarity import CaseSimilarityAnalyzer
-from agents.news_relevance_agent import NewsRelevanceAgent
-from agents.statute_reference_agent import StatuteReferenceAgent
-from agents.bench_bias_agent import BenchBiasAgent
+
+
+# Maximum vector distance for a chunk to count as a relevant precedent
+PRECEDENT_THRESHOLD = 0.35
+
+# Section banners, built once and printed with a single call each
+_BANNER = "=" * 70
+_HDR_PRECEDENT = f"\n{_BANNER}\n🏛️  AGENT 1: PRECEDENT ANALYSIS\n{_BANNER}"
+_HDR_STATUTE = f"\n{_BANNER}\n⚖️  AGENT 2: STATUTE REFERENCE\n{_BANNER}"
+_HDR_NEWS = f"\n{_BANNER}\n📰 AGENT 3: NEWS RELEVANCE\n{_BANNER}"
+_HDR_BENCH = f"\n{_BANNER}\n👨‍⚖️  AGENT 4: BENCH BIAS ANALYSIS\n{_BANNER}"
+_HDR_COMPLETE = f"\n{_BANNER}\n✅ MULTI-AGENT ANALYSIS COMPLETE\n{_BANNER}"
+_HDR_BATCH_COMPLETE = f"\n{_BANNER}\n✅ MULTI-AGENT BATCH ANALYSIS COMPLETE\n{_BANNER}"
 
 
 class MultiAgentOrchestrator:
@@ -37,13 +49,17 @@ class MultiAgentOrchestrator:
         self.enable_statutes = enable_statutes
         self.enable_bench = enable_bench
         
+        # Agents are imported only when enabled to keep startup light
         if enable_news:
+            from agents.news_relevance_agent import NewsRelevanceAgent
             self.news_agent = NewsRelevanceAgent(max_results=5, period='7d')
         
         if enable_statutes:
+            from agents.statute_reference_agent import StatuteReferenceAgent
             self.statute_agent = StatuteReferenceAgent()
         
         if enable_bench:
+            from agents.bench_bias_agent import BenchBiasAgent
             self.bench_agent = BenchBiasAgent()
         
         self.is_initialized = False
@@ -58,14 +74,21 @@ class MultiAgentOrchestrator:
     def analyze_case_complete(self, 
                               case_text: str,
                               k_precedents: int = 5,
-                              max_tokens: int = 2000) -> Dict[str, Any]:
+                              max_tokens: int = 2000,
+                              precedent_threshold: float = PRECEDENT_THRESHOLD,
+                              max_precedents: int = 20) -> Dict[str, Any]:
         """
         Run all enabled agents on the same case text.
         
+        Precedents are retrieved by distance threshold, so the count follows
+        how many relevant cases actually exist.
+        
         Args:
             case_text: The case description
-            k_precedents: Number of precedents to retrieve
+            k_precedents: Minimum number of precedents to retrieve
             max_tokens: Max tokens for AI responses
+            precedent_threshold: Maximum distance for a relevant precedent
+            max_precedents: Maximum number of precedents to retrieve
             
         Returns:
             Dictionary with results from all agents
@@ -76,15 +99,15 @@ class MultiAgentOrchestrator:
         results = {}
         
         # 1. Main Precedent Analysis (Always run)
-        print("\n" + "=" * 70)
-        print("🏛️  AGENT 1: PRECEDENT ANALYSIS")
-        print("=" * 70)
+        print(_HDR_PRECEDENT)
         
         try:
             precedent_result = self.case_analyzer.analyze_case_from_text(
                 case_text, 
                 k=k_precedents, 
-                max_tokens=max_tokens
+                max_tokens=max_tokens,
+                threshold=precedent_threshold,
+                max_results=max_precedents
             )
             results['precedents'] = precedent_result
             print(f"✓ Found {precedent_result['num_similar_cases']} similar precedents")
@@ -92,11 +115,60 @@ class MultiAgentOrchestrator:
             print(f"❌ Error in precedent analysis: {e}")
             results['precedents'] = {'error': str(e)}
         
+        self._run_supporting_agents(case_text, results, max_tokens)
+        
+        print(_HDR_COMPLETE)
+        
+        return results
+    
+    def analyze_batch(self,
+                      case_texts: List[str],
+                      k_precedents: int = 5,
+                      max_tokens: int = 2000) -> List[Dict[str, Any]]:
+        """
+        Run all enabled agents on several cases.
+        
+        Precedents for every case are retrieved in one batched vector
+        search; the remaining agents then run per case.
+        
+        Args:
+            case_texts: The case descriptions
+            k_precedents: Number of precedents to retrieve per case
+            max_tokens: Max tokens for AI responses
+            
+        Returns:
+            List of per-case result dictionaries, in input order
+        """
+        if not self.is_initialized:
+            raise ValueError("Orchestrator not initialized. Call initialize() first.")
+        
+        print(f"\n{_BANNER}\n🏛️  AGENT 1: PRECEDENT ANALYSIS ({len(case_texts)} cases)\n{_BANNER}")
+        
+        try:
+            precedent_results = self.case_analyzer.analyze_cases_from_texts(
+                case_texts,
+                k=k_precedents,
+                max_tokens=max_tokens
+            )
+        except Exception as e:
+            print(f"❌ Error in precedent analysis: {e}")
+            precedent_results = [{'error': str(e)} for _ in case_texts]
+        
+        batch_results = []
+        for case_text, precedent_result in zip(case_texts, precedent_results):
+            results = {'precedents': precedent_result}
+            self._run_supporting_agents(case_text, results, max_tokens)
+            batch_results.append(results)
+        
+        print(_HDR_BATCH_COMPLETE)
+        
+        return batch_results
+    
+    def _run_supporting_agents(self, case_text: str, results: Dict[str, Any], max_tokens: int):
+        """Run the optional agents for one case, adding their output to results."""
         # 2. Statute Reference Analysis (Optional)
         if self.enable_statutes:
-            print("\n" + "=" * 70)
-            print("⚖️  AGENT 2: STATUTE REFERENCE")
-            print("=" * 70)
+            print(_HDR_STATUTE)
             
             try:
                 statute_result = self.statute_agent.analyze_statutes(
@@ -111,9 +183,7 @@ class MultiAgentOrchestrator:
         
         # 3. News Relevance Analysis (Optional)
         if self.enable_news:
-            print("\n" + "=" * 70)
-            print("📰 AGENT 3: NEWS RELEVANCE")
-            print("=" * 70)
+            print(_HDR_NEWS)
             
             try:
                 news_result = self.news_agent.find_relevant_news(
@@ -128,9 +198,7 @@ class MultiAgentOrchestrator:
         
         # 4. Bench Bias Analysis (Optional - depends on precedents)
         if self.enable_bench and 'precedents' in results and 'similar_cases' in results['precedents']:
-            print("\n" + "=" * 70)
-            print("👨‍⚖️  AGENT 4: BENCH BIAS ANALYSIS")
-            print("=" * 70)
+            print(_HDR_BENCH)
             
             try:
                 bench_result = self.bench_agent.analyze_bench_from_cases(
@@ -142,15 +210,10 @@ class MultiAgentOrchestrator:
             except Exception as e:
                 print(f"❌ Error in bench analysis: {e}")
                 results['bench'] = {'error': str(e)}
-        
-        print("\n" + "=" * 70)
-        print("✅ MULTI-AGENT ANALYSIS COMPLETE")
-        print("=" * 70)
-        
-        return results
     
-    def get_enabled_agents(self) -> list:
-        """Get list of enabled agent names."""
+    @cached_property
+    def enabled_agents(self) -> tuple:
+        """Names of enabled agents (fixed at construction, so computed once)."""
         agents = ['Precedent Analysis (Main)']
         if self.enable_statutes:
             agents.append('Statute Reference')
@@ -158,7 +221,11 @@ class MultiAgentOrchestrator:
             agents.append('News Relevance')
         if self.enable_bench:
             agents.append('Bench Bias')
-        return agents
+        return tuple(agents)
+    
+    def get_enabled_agents(self) -> list:
+        """Get list of enabled agent names."""
+        return list(self.enabled_agents)
 
 
 def main():
@@ -223,7 +290,7 @@ def main():
     # Configuration
     print()
     try:
-        k = int(input("Number of precedents (default 5): ") or "5")
+        k = int(input("Minimum number of precedents (default 5): ") or "5")
     except ValueError:
         k = 5
     
@@ -290,37 +357,36 @@ def display_results(results: Dict[str, Any], case_text: str):
     if save == 'y':
         filename = input("Enter filename (default: complete_analysis.md): ").strip() or "complete_analysis.md"
         try:
-            with open(filename, 'w') as f:
-                f.write("# LexiQ Complete Legal Analysis\n\n")
-                f.write("## Case Description\n\n")
-                f.write(case_text[:1000] + ("..." if len(case_text) > 1000 else ""))
-                f.write("\n\n---\n\n")
-                
-                if 'precedents' in results and 'analysis' in results['precedents']:
-                    f.write("## Precedent Analysis\n\n")
-                    f.write(results['precedents']['analysis'])
-                    f.write("\n\n---\n\n")
-                
-                if 'statutes' in results and 'explanation' in results['statutes']:
-                    f.write("## Statute Reference\n\n")
-                    f.write(results['statutes']['explanation'])
-                    f.write("\n\n---\n\n")
-                
-                if 'news' in results and 'analysis' in results['news']:
-                    f.write("## News Relevance\n\n")
-                    f.write(results['news']['analysis'])
-                    f.write("\n\n---\n\n")
-                
-                if 'bench' in results and 'analysis' in results['bench']:
-                    f.write("## Bench Bias Analysis\n\n")
-                    f.write(results['bench']['analysis'])
-                    f.write("\n\n")
-            
+            Path(filename).write_text(_render_markdown(results, case_text), encoding='utf-8')
             print(f"✓ Saved to {filename}")
         except Exception as e:
             print(f"❌ Error saving: {e}")
 
 
+def _render_markdown(results: Dict[str, Any], case_text: str) -> str:
+    """Render the complete analysis as a Markdown document."""
+    parts = [
+        "# LexiQ Complete Legal Analysis\n\n",
+        "## Case Description\n\n",
+        case_text[:1000] + ("..." if len(case_text) > 1000 else ""),
+        "\n\n---\n\n",
+    ]
+    
+    if 'precedents' in results and 'analysis' in results['precedents']:
+        parts += ["## Precedent Analysis\n\n", results['precedents']['analysis'], "\n\n---\n\n"]
+    
+    if 'statutes' in results and 'explanation' in results['statutes']:
+        parts += ["## Statute Reference\n\n", results['statutes']['explanation'], "\n\n---\n\n"]
+    
+    if 'news' in results and 'analysis' in results['news']:
+        parts += ["## News Relevance\n\n", results['news']['analysis'], "\n\n---\n\n"]
+    
+    if 'bench' in results and 'analysis' in results['bench']:
+        parts += ["## Bench Bias Analysis\n\n", results['bench']['analysis'], "\n\n"]
+    
+    return "".join(parts)
+
+
 if __name__ == "__main__":
     main()
 
@@ -6,7 +6,7 @@ Finds recent news relevant to a legal case and provides legal-context-aware anal
 
 import sys
 import os
-from agents.news_relevance_agent import NewsRelevanceAgent
+from pathlib import Path
 
 
 def main():
@@ -94,6 +94,7 @@ def analyze_from_case_description():
     
     # Initialize agent and analyze
     print()
+    from agents.news_relevance_agent import NewsRelevanceAgent
     agent = NewsRelevanceAgent(
         max_results=max_articles,
         period=period
@@ -143,6 +144,7 @@ def quick_keyword_search():
     
     # Search
     print()
+    from agents.news_relevance_agent import NewsRelevanceAgent
     agent = NewsRelevanceAgent(max_results=max_articles, period=period)
     
     try:
@@ -243,6 +245,7 @@ def configure_and_search():
     
     # Initialize and search
     print()
+    from agents.news_relevance_agent import NewsRelevanceAgent
     agent = NewsRelevanceAgent(
         max_results=max_articles,
         period=period,
@@ -319,35 +322,41 @@ def display_results(result: dict, case_text: str):
     if save == 'y':
         filename = input("Enter filename (default: news_analysis.md): ").strip() or "news_analysis.md"
         try:
-            with open(filename, 'w') as f:
-                f.write("# LexiQ News Relevance Analysis\n\n")
-                f.write("## Case Description\n\n")
-                f.write(case_text[:1000] + ("..." if len(case_text) > 1000 else "") + "\n\n")
-                
-                if result.get('entities'):
-                    f.write("## Extracted Entities\n\n")
-                    entities = result['entities']
-                    for key, values in entities.items():
-                        if values:
-                            f.write(f"**{key.replace('_', ' ').title()}:** {', '.join(values)}\n\n")
-                
-                if result.get('keywords'):
-                    f.write(f"**Search Keywords:** {', '.join(result['keywords'])}\n\n")
-                
-                f.write("---\n\n")
-                f.write(result['analysis'])
-                f.write("\n\n## Article Links\n\n")
-                
-                for i, article in enumerate(result['articles'], 1):
-                    f.write(f"{i}. [{article['title']}]({article['url']})\n")
-                    f.write(f"   - Publisher: {article['publisher']}\n")
-                    f.write(f"   - Published: {article['published_date']}\n\n")
-            
+            Path(filename).write_text(_render_markdown(result, case_text), encoding='utf-8')
             print(f"✓ Results saved to {filename}")
         except Exception as e:
             print(f"❌ Error saving file: {e}")
 
 
+def _render_markdown(result: dict, case_text: str) -> str:
+    """Render news analysis results as a Markdown document."""
+    parts = [
+        "# LexiQ News Relevance Analysis\n\n",
+        "## Case Description\n\n",
+        case_text[:1000] + ("..." if len(case_text) > 1000 else "") + "\n\n",
+    ]
+    
+    if result.get('entities'):
+        parts.append("## Extracted Entities\n\n")
+        for key, values in result['entities'].items():
+            if values:
+                parts.append(f"**{key.replace('_', ' ').title()}:** {', '.join(values)}\n\n")
+    
+    if result.get('keywords'):
+        parts.append(f"**Search Keywords:** {', '.join(result['keywords'])}\n\n")
+    
+    parts += ["---\n\n", result['analysis'], "\n\n## Article Links\n\n"]
+    
+    for i, article in enumerate(result['articles'], 1):
+        parts.append(
+            f"{i}. [{article['title']}]({article['url']})\n"
+            f"   - Publisher: {article['publisher']}\n"
+            f"   - Published: {article['published_date']}\n\n"
+        )
+    
+    return "".join(parts)
+
+
 def analyze_single_case_news(case_text: str, max_articles: int = 5) -> dict:
     """
     Convenience function for API/script usage.
@@ -359,6 +368,7 @@ def analyze_single_case_news(case_text: str, max_articles: int = 5) -> dict:
     Returns:
         Analysis results dictionary
     """
+    from agents.news_relevance_agent import NewsRelevanceAgent
     agent = NewsRelevanceAgent(max_results=max_articles)
     return agent.find_relevant_news(case_text)
 
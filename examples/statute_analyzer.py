@@ -5,7 +5,6 @@ Extracts and explains legal provisions from case text.
 """
 
 import sys
-from agents.statute_reference_agent import StatuteReferenceAgent
 
 
 def main():
@@ -16,8 +15,6 @@ def main():
     print("=" * 70)
     print()
     
-    agent = StatuteReferenceAgent()
-    
     while True:
         print("\n" + "=" * 70)
         print("📋 OPTIONS")
@@ -62,6 +59,7 @@ def analyze_full():
         return
     
     print()
+    from agents.statute_reference_agent import StatuteReferenceAgent
     agent = StatuteReferenceAgent()
     
     try:
@@ -95,6 +93,7 @@ def quick_extract():
         return
     
     print()
+    from agents.statute_reference_agent import StatuteReferenceAgent
     agent = StatuteReferenceAgent()
     
     try:
@@ -163,6 +162,7 @@ def display_results(result: dict):
 
 def analyze_text(case_text: str) -> dict:
     """API function for programmatic use."""
+    from agents.statute_reference_agent import StatuteReferenceAgent
     agent = StatuteReferenceAgent()
     return agent.analyze_statutes(case_text)
 
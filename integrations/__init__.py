@@ -3,6 +3,6 @@ LexiQ Integrations Module
 Handles external API integrations for compliance and audit logging
 """
 
-from .vanta_client import VantaClient
+from .vanta_client import VantaClient, BatchingVantaClient
 
-__all__ = ['VantaClient']
+__all__ = ['VantaClient', 'BatchingVantaClient']
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Content Hashing
+Content-integrity fingerprints shared by the Vanta clients.
+
+The integrity algorithm is SHA-256 by default. Set LEXIQ_INTEGRITY_HASH=blake3
+(with the blake3 package installed) to use BLAKE3 where only integrity, not a
+mandated algorithm, is required.
+"""
+
+import hashlib
+import mmap
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import IO, Any, Callable, Iterable, List, Optional, Tuple, Union
+
+# Text or any bytes-like buffer; bytes-like input is hashed without copying
+Content = Union[str, bytes, bytearray, memoryview]
+
+
+@lru_cache(maxsize=None)
+def _integrity_backend() -> Tuple[Callable[[bytes], Any], str]:
+    """Resolve the configured integrity hash on first use (after .env is loaded)."""
+    if os.getenv("LEXIQ_INTEGRITY_HASH", "sha256").lower() == "blake3":
+        try:
+            from blake3 import blake3
+            return blake3, "BLAKE3"
+        except ImportError:
+            print("⚠️ blake3 not installed - using SHA-256 for content integrity")
+    return hashlib.sha256, "SHA-256"
+
+
+def _to_bytes(content: Content):
+    """Encode text as UTF-8; pass bytes-like buffers through untouched."""
+    if isinstance(content, str):
+        return content.encode('utf-8')
+    return content
+
+
+def integrity_hash_algorithm() -> str:
+    """Name of the configured integrity hash, as reported in audit payloads."""
+    return _integrity_backend()[1]
+
+
+def compute_sha256(content: Content) -> str:
+    """
+    Compute SHA-256 hash of content, regardless of configuration.
+    
+    Args:
+        content: Text content to hash
+        
+    Returns:
+        SHA-256 hash as hex string
+    """
+    return hashlib.sha256(_to_bytes(content)).hexdigest()
+
+
+def compute_content_hash(content: Content) -> str:
+    """
+    Compute the configured integrity hash of content.
+    
+    Nothing is memoized: the content is often the original, unredacted
+    text, and a cache keyed on it would keep that PII in memory.
+    
+    Args:
+        content: Text content to hash
+        
+    Returns:
+        Hash as hex string
+    """
+    return _integrity_backend()[0](_to_bytes(content)).hexdigest()
+
+
+def compute_content_hash_stream(reader: IO[bytes], chunk_size: int = 1 << 16) -> str:
+    """
+    Compute the configured integrity hash of a binary stream chunk by chunk.
+    
+    Only one chunk is held in memory at a time, so large documents can be
+    hashed straight from an open file without loading them whole.
+    
+    Args:
+        reader: Binary file-like object (open file, io.BytesIO, ...)
+        chunk_size: Bytes read per update (default 64 KiB)
+        
+    Returns:
+        Hash as hex string, identical to compute_content_hash of the full content
+    """
+    hasher = _integrity_backend()[0]()
+    for chunk in iter(lambda: reader.read(chunk_size), b""):
+        hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def compute_file_hash(path: str) -> str:
+    """
+    Compute the configured integrity hash of a file via a read-only memory map.
+    
+    The mapping is handed to the hash as a buffer, so the file is never copied
+    into a Python bytes object; the OS pages it in as the hash reads it.
+    
+    Args:
+        path: Path to the file (e.g. a case PDF)
+        
+    Returns:
+        Hash as hex string, identical to compute_content_hash of the file bytes
+    """
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return compute_content_hash(b"")  # empty files cannot be mapped
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return compute_content_hash(mapped)
+
+
+def compute_content_hash_pair(original: Content, masked: Content) -> Tuple[str, str]:
+    """
+    Compute integrity hashes of an original text and its masked counterpart.
+    
+    Args:
+        original: Original text or bytes-like content
+        masked: Masked text or bytes-like content
+        
+    Returns:
+        Tuple of (original hash, masked hash) as hex strings
+    """
+    return compute_content_hash(original), compute_content_hash(masked)
+
+
+def _hash_pair(pair: Tuple[Content, Content]) -> Tuple[str, str]:
+    return compute_content_hash_pair(*pair)
+
+
+def compute_content_hash_pairs(pairs: Iterable[Tuple[Content, Content]],
+                               max_workers: Optional[int] = None) -> List[Tuple[str, str]]:
+    """
+    Hash many (original, masked) pairs in parallel.
+    
+    hashlib releases the GIL while hashing buffers larger than a couple of
+    KiB, so a thread pool spreads multi-document runs across all cores.
+    
+    Args:
+        pairs: Iterable of (original, masked) content pairs
+        max_workers: Worker threads (defaults to the CPU count)
+        
+    Returns:
+        List of (original hash, masked hash) tuples, in input order
+    """
+    with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+        return list(executor.map(_hash_pair, pairs))
@@ -4,18 +4,38 @@ Vanta API Client
 Handles PII masking job logging and compliance monitoring
 """
 
-import hashlib
-import json
+import asyncio
+import atexit
+import bisect
+import importlib.util
+import threading
+import time
+import httpx
 import requests
-from typing import Dict, List, Any, Optional
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import IO, Dict, List, Any, Optional, Tuple
+from collections import Counter, deque
 from datetime import datetime, timezone
 import os
 from dataclasses import dataclass
 from dotenv import load_dotenv
 
+from security import json_codec
+
+from . import content_hash
+
 # Load environment variables from .env file
 load_dotenv()
 
+# HTTP/2 multiplexing needs the optional h2 package
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+# Remaining-PII upper bounds for each risk level (anything above is CRITICAL)
+_RISK_THRESHOLDS = (0, 2, 5)
+_RISK_LABELS = ("LOW", "MEDIUM", "HIGH", "CRITICAL")
+
 
 @dataclass
 class PIIMaskingResult:
@@ -39,8 +59,8 @@ class VantaClient:
     Vanta API client for PII masking job logging and compliance monitoring.
     
     Features:
-    - OAuth authentication with Vanta
-    - SHA-256 hash computation for content integrity
+    - OAuth authentication with Vanta (lazy, on the first API call)
+    - SHA-256 (or BLAKE3) hash computation for content integrity
     - Custom resource payload formatting
     - Pass/fail determination based on PII counts
     - Audit logging for compliance
@@ -63,15 +83,34 @@ class VantaClient:
         self.base_url = base_url or os.getenv("VANTA_BASE_URL", "https://api.vanta.com")
         self.access_token = None
         self.token_expires_at = None
+        self._auth_headers = None
+        self._token_expiry_ns = float("inf")  # time.monotonic_ns() refresh deadline
+        self._auth_lock = threading.Lock()
+        
+        # Pooled keep-alive session so requests reuse the TCP/TLS connection
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=20,
+            max_retries=Retry(total=3, backoff_factor=0.3)
+        )
+        self._session.mount("https://", adapter)
+        self._session.headers.update({"Accept": "application/json"})
         
         # API endpoints
         self.auth_endpoint = f"{self.base_url}/oauth/token"
         self.resources_endpoint = f"{self.base_url}/v1/resources"
         self.custom_resources_endpoint = f"{self.base_url}/v1/integrations"
+        self.batch_resources_endpoint = f"{self.base_url}/v1/integrations:batchCreate"
         
-        # Initialize authentication
-        if self.client_id and self.client_secret:
-            self._authenticate()
+        # Constant audit fields, built once rather than for every payload
+        self._audit_template = {
+            "job_type": "PII_MASKING",
+            "system": "LexiQ",
+            "version": "1.0.0",
+            "environment": os.getenv("ENVIRONMENT", "development")
+        }
+        self._audit_json = json_codec.dumps_bytes(self._audit_template)
     
     def _authenticate(self) -> bool:
         """
@@ -88,7 +127,7 @@ class VantaClient:
                 "scope": "vanta-api.all:read vanta-api.all:write"
             }
             
-            response = requests.post(
+            response = self._session.post(
                 self.auth_endpoint,
                 data=auth_data,
                 headers={"Content-Type": "application/x-www-form-urlencoded"},
@@ -100,6 +139,12 @@ class VantaClient:
                 self.access_token = token_data["access_token"]
                 expires_in = token_data.get("expires_in", 3600)
                 self.token_expires_at = datetime.now(timezone.utc).timestamp() + expires_in
+                # Refresh 5 minutes early, tracked in integer monotonic nanoseconds
+                self._token_expiry_ns = time.monotonic_ns() + (expires_in - 300) * 1_000_000_000
+                self._auth_headers = {
+                    "Authorization": f"Bearer {self.access_token}",
+                    "Content-Type": "application/json"
+                }
                 
                 print("✅ Vanta authentication successful")
                 return True
@@ -112,38 +157,93 @@ class VantaClient:
             return False
     
     def _ensure_authenticated(self) -> bool:
-        """Ensure we have a valid access token."""
-        if not self.access_token:
-            return self._authenticate()
+        """
+        Ensure we have a valid access token, authenticating on first use.
         
-        # Check if token is expired (with 5-minute buffer)
-        if (self.token_expires_at and 
-            datetime.now(timezone.utc).timestamp() > (self.token_expires_at - 300)):
-            print("🔄 Vanta token expired, refreshing...")
-            return self._authenticate()
+        Authentication is lazy so constructing a client (or using the static
+        hashing helpers) never costs an OAuth round-trip. The lock makes sure
+        concurrent callers trigger only one token request.
+        """
+        if self.access_token and time.monotonic_ns() <= self._token_expiry_ns:
+            return True
         
-        return True
+        with self._auth_lock:
+            # Another thread may have authenticated while we waited
+            if not self.access_token:
+                return self._authenticate()
+            
+            # Check if token is expired (with 5-minute buffer)
+            if time.monotonic_ns() > self._token_expiry_ns:
+                print("🔄 Vanta token expired, refreshing...")
+                return self._authenticate()
+            
+            return True
     
     def _get_auth_headers(self) -> Dict[str, str]:
-        """Get headers with authentication token."""
-        return {
-            "Authorization": f"Bearer {self.access_token}",
-            "Content-Type": "application/json",
-            "Accept": "application/json"
-        }
+        """Get headers with authentication token (Accept is set on the session)."""
+        if self._auth_headers is None:
+            self._auth_headers = {
+                "Authorization": f"Bearer {self.access_token}",
+                "Content-Type": "application/json"
+            }
+        return self._auth_headers
+    
+    @staticmethod
+    def compute_content_hash(content: content_hash.Content) -> str:
+        """
+        Compute the content-integrity hash (SHA-256 unless configured otherwise).
+        
+        Args:
+            content: Text or bytes-like content to hash
+            
+        Returns:
+            Hash as hex string
+        """
+        return content_hash.compute_content_hash(content)
+    
+    @staticmethod
+    def compute_content_hash_stream(reader: IO[bytes], chunk_size: int = 1 << 16) -> str:
+        """
+        Compute the content-integrity hash of a binary stream in fixed-size chunks.
+        
+        Args:
+            reader: Binary file-like object
+            chunk_size: Bytes read per update (default 64 KiB)
+            
+        Returns:
+            Hash as hex string
+        """
+        return content_hash.compute_content_hash_stream(reader, chunk_size)
+    
+    @staticmethod
+    def compute_pair_hashes(original: content_hash.Content,
+                            masked: content_hash.Content) -> Tuple[str, str]:
+        """
+        Compute integrity hashes of original and masked content in one call.
+        
+        Args:
+            original: Original text or bytes-like content
+            masked: Masked text or bytes-like content
+            
+        Returns:
+            Tuple of (original hash, masked hash) as hex strings
+        """
+        return content_hash.compute_content_hash_pair(original, masked)
     
     @staticmethod
-    def compute_content_hash(content: str) -> str:
+    def compute_pair_hashes_batch(pairs: List[Tuple[content_hash.Content, content_hash.Content]],
+                                  max_workers: Optional[int] = None) -> List[Tuple[str, str]]:
         """
-        Compute SHA-256 hash of content.
+        Compute integrity hashes for many original/masked pairs on a thread pool.
         
         Args:
-            content: Text content to hash
+            pairs: (original, masked) content pairs
+            max_workers: Worker threads (defaults to the CPU count)
             
         Returns:
-            SHA-256 hash as hex string
+            List of (original hash, masked hash) tuples, in input order
         """
-        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+        return content_hash.compute_content_hash_pairs(pairs, max_workers)
     
     def determine_masking_success(self, 
                                  pii_counts_before: Dict[str, int],
@@ -160,9 +260,27 @@ class VantaClient:
         Returns:
             True if masking successful, False otherwise
         """
-        total_before = sum(pii_counts_before.values())
-        total_after = sum(pii_counts_after.values())
+        return self.masking_success_from_totals(
+            sum(pii_counts_before.values()),
+            sum(pii_counts_after.values()),
+            threshold
+        )
+    
+    @staticmethod
+    def masking_success_from_totals(total_before: int,
+                                    total_after: int,
+                                    threshold: float = 0.95) -> bool:
+        """
+        Determine masking success from precomputed PII totals.
         
+        Args:
+            total_before: Total PII count before masking
+            total_after: Total PII count after masking
+            threshold: Success threshold (0.95 = 95% reduction required)
+            
+        Returns:
+            True if masking successful, False otherwise
+        """
         if total_before == 0:
             return True  # No PII to mask
         
@@ -179,6 +297,15 @@ class VantaClient:
         Returns:
             Formatted payload for Vanta API
         """
+        payload = self._structure_payload_fields(result)
+        payload["audit"] = {**self._audit_template}
+        return payload
+    
+    def _structure_payload_fields(self, result: PIIMaskingResult) -> Dict[str, Any]:
+        """Build the per-job part of the payload (everything except the constant audit section)."""
+        total_before = sum(result.pii_counts_before.values())
+        total_after = sum(result.pii_counts_after.values())
+        
         payload = {
             "resourceType": "PII_MASKING_JOB",
             "resourceId": result.job_id,
@@ -192,51 +319,45 @@ class VantaClient:
             "integrity": {
                 "original_content_hash": result.original_content_hash,
                 "masked_content_hash": result.masked_content_hash,
-                "hash_algorithm": "SHA-256"
+                "hash_algorithm": content_hash.integrity_hash_algorithm()
             },
             "pii_analysis": {
                 "types_detected": result.pii_types_detected,
                 "counts_before_masking": result.pii_counts_before,
                 "counts_after_masking": result.pii_counts_after,
-                "total_pii_before": sum(result.pii_counts_before.values()),
-                "total_pii_after": sum(result.pii_counts_after.values())
+                "total_pii_before": total_before,
+                "total_pii_after": total_after
             },
             "compliance": {
                 "masking_success": result.masking_success,
                 "success_threshold": 0.95,
                 "compliance_status": "PASS" if result.masking_success else "FAIL",
-                "risk_level": self._assess_risk_level(result.pii_counts_after)
-            },
-            "audit": {
-                "job_type": "PII_MASKING",
-                "system": "LexiQ",
-                "version": "1.0.0",
-                "environment": os.getenv("ENVIRONMENT", "development")
+                "risk_level": self._assess_risk_level(total_after)
             }
         }
         
         return payload
     
-    def _assess_risk_level(self, pii_counts_after: Dict[str, int]) -> str:
+    def _encode_payload(self, fields: Dict[str, Any]) -> bytes:
+        """
+        Serialize payload fields and splice in the pre-serialized audit section.
+        
+        The audit section is identical for every job, so it is encoded once in
+        __init__ rather than on every request.
+        """
+        return json_codec.dumps_bytes(fields)[:-1] + b',"audit":' + self._audit_json + b'}'
+    
+    def _assess_risk_level(self, total_remaining: int) -> str:
         """
         Assess risk level based on remaining PII.
         
         Args:
-            pii_counts_after: PII counts after masking
+            total_remaining: Total PII count after masking
             
         Returns:
             Risk level: LOW, MEDIUM, HIGH, CRITICAL
         """
-        total_remaining = sum(pii_counts_after.values())
-        
-        if total_remaining == 0:
-            return "LOW"
-        elif total_remaining <= 2:
-            return "MEDIUM"
-        elif total_remaining <= 5:
-            return "HIGH"
-        else:
-            return "CRITICAL"
+        return _RISK_LABELS[bisect.bisect_left(_RISK_THRESHOLDS, total_remaining)]
     
     def log_pii_masking_result(self, result: PIIMaskingResult) -> Dict[str, Any]:
         """
@@ -255,31 +376,118 @@ class VantaClient:
             }
         
         try:
-            payload = self.structure_pii_masking_payload(result)
+            payload = self._structure_payload_fields(result)
             
-            response = requests.post(
+            response = self._session.post(
                 self.custom_resources_endpoint,
-                json=payload,
+                data=self._encode_payload(payload),
+                headers=self._get_auth_headers(),
+                timeout=30
+            )
+            
+            return self._handle_log_response(response, result, payload)
+                
+        except Exception as e:
+            print(f"❌ Error logging to Vanta: {e}")
+            return {
+                "success": False,
+                "error": str(e)
+            }
+    
+    def log_pii_masking_results_bulk(self, results: List[PIIMaskingResult]) -> Dict[str, Any]:
+        """
+        Log several PII masking results to Vanta in a single request.
+        
+        Args:
+            results: PII masking results
+            
+        Returns:
+            API response data for the whole batch
+        """
+        if not results:
+            return {"success": True, "job_ids": [], "count": 0}
+        
+        if not self._ensure_authenticated():
+            return {
+                "success": False,
+                "error": "Authentication failed"
+            }
+        
+        job_ids = [result.job_id for result in results]
+        
+        try:
+            body = b'{"resources":[' + b','.join(
+                self._encode_payload(self._structure_payload_fields(result)) for result in results
+            ) + b']}'
+            
+            response = self._session.post(
+                self.batch_resources_endpoint,
+                data=body,
                 headers=self._get_auth_headers(),
                 timeout=30
             )
             
             if response.status_code in [200, 201]:
-                print(f"✅ PII masking result logged to Vanta: {result.job_id}")
+                print(f"✅ {len(results)} PII masking results logged to Vanta")
                 return {
                     "success": True,
-                    "resource_id": response.json().get("id"),
-                    "job_id": result.job_id,
-                    "compliance_status": payload["compliance"]["compliance_status"]
+                    "job_ids": job_ids,
+                    "count": len(results)
                 }
             else:
-                print(f"❌ Failed to log to Vanta: {response.status_code} - {response.text}")
+                print(f"❌ Failed to bulk log to Vanta: {response.status_code} - {response.text}")
                 return {
                     "success": False,
+                    "job_ids": job_ids,
                     "error": f"API error: {response.status_code}",
                     "details": response.text
                 }
                 
+        except Exception as e:
+            print(f"❌ Error bulk logging to Vanta: {e}")
+            return {
+                "success": False,
+                "job_ids": job_ids,
+                "error": str(e)
+            }
+    
+    async def log_pii_masking_result_async(self,
+                                           result: PIIMaskingResult,
+                                           client: httpx.AsyncClient) -> Dict[str, Any]:
+        """
+        Log PII masking result to Vanta without blocking the event loop.
+        
+        Args:
+            result: PII masking result
+            client: Shared async HTTP client (see log_pii_masking_results)
+            
+        Returns:
+            API response data
+        """
+        # A token request is a blocking HTTP round-trip; run it in a worker
+        # thread unless the current token is still valid
+        if self.access_token and time.monotonic_ns() <= self._token_expiry_ns:
+            authenticated = True
+        else:
+            authenticated = await asyncio.to_thread(self._ensure_authenticated)
+        
+        if not authenticated:
+            return {
+                "success": False,
+                "error": "Authentication failed"
+            }
+        
+        try:
+            payload = self._structure_payload_fields(result)
+            
+            response = await client.post(
+                self.custom_resources_endpoint,
+                content=self._encode_payload(payload),
+                headers=self._get_auth_headers()
+            )
+            
+            return self._handle_log_response(response, result, payload)
+                
         except Exception as e:
             print(f"❌ Error logging to Vanta: {e}")
             return {
@@ -287,6 +495,59 @@ class VantaClient:
                 "error": str(e)
             }
     
+    def log_pii_masking_results(self, results: List[PIIMaskingResult]) -> List[Dict[str, Any]]:
+        """
+        Log many PII masking results concurrently over one shared connection.
+        
+        Must not be called from inside a running event loop; async callers
+        should await log_pii_masking_result_async directly.
+        
+        Args:
+            results: PII masking results
+            
+        Returns:
+            API response data for each result, in input order
+        """
+        return asyncio.run(self._log_pii_masking_results_async(results))
+    
+    async def _log_pii_masking_results_async(self, results: List[PIIMaskingResult]) -> List[Dict[str, Any]]:
+        """Gather async log calls on a client scoped to the current event loop."""
+        if not results:
+            return []
+        
+        # Authenticate once up front (off the event loop) so the gathered
+        # calls find a valid token instead of each waiting on the auth lock
+        if not await asyncio.to_thread(self._ensure_authenticated):
+            return [{"success": False, "error": "Authentication failed"} for _ in results]
+        
+        async with httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+            timeout=30.0,
+            headers={"Accept": "application/json"}
+        ) as client:
+            return await asyncio.gather(
+                *(self.log_pii_masking_result_async(result, client) for result in results)
+            )
+    
+    def _handle_log_response(self, response, result: PIIMaskingResult, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Turn a requests/httpx response to a log call into the result dictionary."""
+        if response.status_code in [200, 201]:
+            print(f"✅ PII masking result logged to Vanta: {result.job_id}")
+            return {
+                "success": True,
+                "resource_id": response.json().get("id"),
+                "job_id": result.job_id,
+                "compliance_status": payload["compliance"]["compliance_status"]
+            }
+        else:
+            print(f"❌ Failed to log to Vanta: {response.status_code} - {response.text}")
+            return {
+                "success": False,
+                "error": f"API error: {response.status_code}",
+                "details": response.text
+            }
+    
     def get_compliance_summary(self, 
                               case_id: str = None,
                               user_id: str = None,
@@ -316,7 +577,7 @@ class VantaClient:
             if user_id:
                 params["user_id"] = user_id
             
-            response = requests.get(
+            response = self._session.get(
                 self.custom_resources_endpoint,
                 params=params,
                 headers=self._get_auth_headers(),
@@ -344,7 +605,8 @@ class VantaClient:
     def _analyze_compliance_data(self, data: List[Dict]) -> Dict[str, Any]:
         """Analyze compliance data for summary."""
         total_jobs = len(data)
-        successful_jobs = sum(1 for job in data if job.get("compliance", {}).get("masking_success", False))
+        masking_successes = [bool(job.get("compliance", {}).get("masking_success", False)) for job in data]
+        successful_jobs = sum(masking_successes)
         
         return {
             "total_jobs": total_jobs,
@@ -356,14 +618,110 @@ class VantaClient:
     
     def _calculate_risk_distribution(self, data: List[Dict]) -> Dict[str, int]:
         """Calculate risk level distribution."""
-        distribution = {"LOW": 0, "MEDIUM": 0, "HIGH": 0, "CRITICAL": 0}
+        counts = Counter(job.get("compliance", {}).get("risk_level", "UNKNOWN") for job in data)
+        return {level: counts[level] for level in ("LOW", "MEDIUM", "HIGH", "CRITICAL")}
+
+
+class BatchingVantaClient:
+    """
+    Buffers PII masking results and logs them to Vanta in bulk.
+    
+    A batch is sent once max_batch_size results are queued, or every
+    flush_interval seconds from a background thread, whichever comes first.
+    A batch Vanta doesn't accept is put back at the head of the queue and
+    retried on the next flush. close() (called on interpreter exit if it
+    wasn't called before, or by the context manager) flushes what remains.
+    """
+    
+    def __init__(self,
+                 client: VantaClient = None,
+                 max_batch_size: int = 64,
+                 flush_interval: float = 2.0):
+        """
+        Initialize the batching client.
+        
+        Args:
+            client: Vanta client used for bulk requests (created if not provided)
+            max_batch_size: Number of queued results that triggers a flush
+            flush_interval: Seconds between background flushes
+        """
+        self.client = client or VantaClient()
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval
+        
+        self._buffer = deque()
+        self._flush_lock = threading.Lock()
+        # After a failed flush, full batches wait for the background retry
+        # instead of hitting Vanta again on every enqueue
+        self._retry_after = 0.0
+        self._stopped = threading.Event()
+        self._flusher = threading.Thread(
+            target=self._flush_periodically,
+            name="vanta-batch-flush",
+            daemon=True
+        )
+        self._flusher.start()
+        
+        # The flusher is a daemon thread; don't lose the last batch on exit
+        atexit.register(self.close)
+    
+    def enqueue(self, result: PIIMaskingResult):
+        """Queue a result, flushing immediately if the batch is full."""
+        self._buffer.append(result)
+        if len(self._buffer) >= self.max_batch_size and time.monotonic() >= self._retry_after:
+            self.flush()
+    
+    def flush(self) -> Optional[Dict[str, Any]]:
+        """
+        Send all queued results in one bulk request.
         
-        for job in data:
-            risk_level = job.get("compliance", {}).get("risk_level", "UNKNOWN")
-            if risk_level in distribution:
-                distribution[risk_level] += 1
+        If the request fails (or raises), the results are requeued ahead of
+        anything enqueued meanwhile, so no result is dropped.
         
-        return distribution
+        Returns:
+            Bulk API response data, or None if nothing was queued
+        """
+        with self._flush_lock:
+            batch = []
+            while self._buffer:
+                batch.append(self._buffer.popleft())
+            
+            if not batch:
+                return None
+            
+            response = None
+            try:
+                response = self.client.log_pii_masking_results_bulk(batch)
+            finally:
+                if not (response and response.get("success")):
+                    self._buffer.extendleft(reversed(batch))
+                    self._retry_after = time.monotonic() + self.flush_interval
+            return response
+    
+    def close(self):
+        """Stop the background flusher and send any remaining results."""
+        atexit.unregister(self.close)
+        self._stopped.set()
+        self._flusher.join()
+        self.flush()
+        
+        if self._buffer:
+            print(f"❌ {len(self._buffer)} PII masking results could not be logged to Vanta")
+    
+    def _flush_periodically(self):
+        """Background loop flushing the buffer every flush_interval seconds."""
+        while not self._stopped.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                # Results were requeued; keep the thread alive for the retry
+                print(f"❌ Error flushing Vanta batch: {e}")
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
 
 def create_vanta_client() -> VantaClient:
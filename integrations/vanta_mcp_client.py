@@ -4,13 +4,20 @@ Vanta MCP Client
 Uses Cursor's MCP server for proper Vanta integration
 """
 
+import bisect
 import json
-import hashlib
-from typing import Dict, List, Any, Optional
+from typing import IO, Dict, List, Any, Optional, Tuple, Union
 from datetime import datetime, timezone
 from dataclasses import dataclass
 import os
 
+from . import content_hash
+
+
+# Remaining-PII upper bounds for each risk level (anything above is CRITICAL)
+_RISK_THRESHOLDS = (0, 2, 5)
+_RISK_LABELS = ("LOW", "MEDIUM", "HIGH", "CRITICAL")
+
 
 @dataclass
 class PIIMaskingResult:
@@ -29,6 +36,45 @@ class PIIMaskingResult:
     user_id: Optional[str] = None
 
 
+@dataclass(frozen=True, slots=True)
+class MCPLogAck:
+    """
+    Acknowledgement for a payload prepared for the MCP server.
+    
+    A slotted, immutable record instead of a per-call dict. It keeps the
+    read-only dictionary interface of the log responses (get, [], in, keys;
+    dict(ack) and to_dict() give a plain dict), limited to the fields below.
+    """
+    resource_id: str
+    job_id: str
+    compliance_status: str
+    mcp_integration: bool = True
+    success: bool = True
+    payload_prepared: bool = True
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        """Dictionary-style field access."""
+        if key in self.__dataclass_fields__:
+            return getattr(self, key)
+        return default
+    
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.__dataclass_fields__:
+            raise KeyError(key)
+        return getattr(self, key)
+    
+    def __contains__(self, key: str) -> bool:
+        return key in self.__dataclass_fields__
+    
+    def keys(self):
+        """Field names, in declaration order."""
+        return self.__dataclass_fields__.keys()
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dictionary of the fields, e.g. for JSON serialization."""
+        return {key: getattr(self, key) for key in self.__dataclass_fields__}
+
+
 class VantaMCPClient:
     """
     Vanta MCP Client for PII masking job logging.
@@ -49,17 +95,61 @@ class VantaMCPClient:
         print(f"📁 Credentials file: {self.credentials_file}")
     
     @staticmethod
-    def compute_content_hash(content: str) -> str:
+    def compute_content_hash(content: content_hash.Content) -> str:
         """
-        Compute SHA-256 hash of content.
+        Compute the content-integrity hash (SHA-256 unless configured otherwise).
         
         Args:
-            content: Text content to hash
+            content: Text or bytes-like content to hash
             
         Returns:
-            SHA-256 hash as hex string
+            Hash as hex string
         """
-        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+        return content_hash.compute_content_hash(content)
+    
+    @staticmethod
+    def compute_content_hash_stream(reader: IO[bytes], chunk_size: int = 1 << 16) -> str:
+        """
+        Compute the content-integrity hash of a binary stream in fixed-size chunks.
+        
+        Args:
+            reader: Binary file-like object
+            chunk_size: Bytes read per update (default 64 KiB)
+            
+        Returns:
+            Hash as hex string
+        """
+        return content_hash.compute_content_hash_stream(reader, chunk_size)
+    
+    @staticmethod
+    def compute_pair_hashes(original: content_hash.Content,
+                            masked: content_hash.Content) -> Tuple[str, str]:
+        """
+        Compute integrity hashes of original and masked content in one call.
+        
+        Args:
+            original: Original text or bytes-like content
+            masked: Masked text or bytes-like content
+            
+        Returns:
+            Tuple of (original hash, masked hash) as hex strings
+        """
+        return content_hash.compute_content_hash_pair(original, masked)
+    
+    @staticmethod
+    def compute_pair_hashes_batch(pairs: List[Tuple[content_hash.Content, content_hash.Content]],
+                                  max_workers: Optional[int] = None) -> List[Tuple[str, str]]:
+        """
+        Compute integrity hashes for many original/masked pairs on a thread pool.
+        
+        Args:
+            pairs: (original, masked) content pairs
+            max_workers: Worker threads (defaults to the CPU count)
+            
+        Returns:
+            List of (original hash, masked hash) tuples, in input order
+        """
+        return content_hash.compute_content_hash_pairs(pairs, max_workers)
     
     def determine_masking_success(self, 
                                  pii_counts_before: Dict[str, int],
@@ -76,9 +166,27 @@ class VantaMCPClient:
         Returns:
             True if masking successful, False otherwise
         """
-        total_before = sum(pii_counts_before.values())
-        total_after = sum(pii_counts_after.values())
+        return self.masking_success_from_totals(
+            sum(pii_counts_before.values()),
+            sum(pii_counts_after.values()),
+            threshold
+        )
+    
+    @staticmethod
+    def masking_success_from_totals(total_before: int,
+                                    total_after: int,
+                                    threshold: float = 0.95) -> bool:
+        """
+        Determine masking success from precomputed PII totals.
         
+        Args:
+            total_before: Total PII count before masking
+            total_after: Total PII count after masking
+            threshold: Success threshold (0.95 = 95% reduction required)
+            
+        Returns:
+            True if masking successful, False otherwise
+        """
         if total_before == 0:
             return True  # No PII to mask
         
@@ -95,6 +203,9 @@ class VantaMCPClient:
         Returns:
             Formatted payload for Vanta MCP
         """
+        total_before = sum(result.pii_counts_before.values())
+        total_after = sum(result.pii_counts_after.values())
+        
         payload = {
             "resourceType": "PII_MASKING_JOB",
             "resourceId": result.job_id,
@@ -108,20 +219,20 @@ class VantaMCPClient:
             "integrity": {
                 "original_content_hash": result.original_content_hash,
                 "masked_content_hash": result.masked_content_hash,
-                "hash_algorithm": "SHA-256"
+                "hash_algorithm": content_hash.integrity_hash_algorithm()
             },
             "pii_analysis": {
                 "types_detected": result.pii_types_detected,
                 "counts_before_masking": result.pii_counts_before,
                 "counts_after_masking": result.pii_counts_after,
-                "total_pii_before": sum(result.pii_counts_before.values()),
-                "total_pii_after": sum(result.pii_counts_after.values())
+                "total_pii_before": total_before,
+                "total_pii_after": total_after
             },
             "compliance": {
                 "masking_success": result.masking_success,
                 "success_threshold": 0.95,
                 "compliance_status": "PASS" if result.masking_success else "FAIL",
-                "risk_level": self._assess_risk_level(result.pii_counts_after)
+                "risk_level": self._assess_risk_level(total_after)
             },
             "audit": {
                 "job_type": "PII_MASKING",
@@ -133,28 +244,19 @@ class VantaMCPClient:
         
         return payload
     
-    def _assess_risk_level(self, pii_counts_after: Dict[str, int]) -> str:
+    def _assess_risk_level(self, total_remaining: int) -> str:
         """
         Assess risk level based on remaining PII.
         
         Args:
-            pii_counts_after: PII counts after masking
+            total_remaining: Total PII count after masking
             
         Returns:
             Risk level: LOW, MEDIUM, HIGH, CRITICAL
         """
-        total_remaining = sum(pii_counts_after.values())
-        
-        if total_remaining == 0:
-            return "LOW"
-        elif total_remaining <= 2:
-            return "MEDIUM"
-        elif total_remaining <= 5:
-            return "HIGH"
-        else:
-            return "CRITICAL"
+        return _RISK_LABELS[bisect.bisect_left(_RISK_THRESHOLDS, total_remaining)]
     
-    def log_pii_masking_result(self, result: PIIMaskingResult) -> Dict[str, Any]:
+    def log_pii_masking_result(self, result: PIIMaskingResult) -> Union[MCPLogAck, Dict[str, Any]]:
         """
         Log PII masking result via MCP server.
         
@@ -165,7 +267,7 @@ class VantaMCPClient:
             result: PII masking result
             
         Returns:
-            API response data
+            MCPLogAck on success, or an error dictionary
         """
         try:
             payload = self.structure_pii_masking_payload(result)
@@ -177,14 +279,11 @@ class VantaMCPClient:
             
             # In a real MCP integration, this would be handled by the MCP server
             # For now, we'll return a success response
-            return {
-                "success": True,
-                "resource_id": result.job_id,
-                "job_id": result.job_id,
-                "compliance_status": payload["compliance"]["compliance_status"],
-                "mcp_integration": True,
-                "payload_prepared": True
-            }
+            return MCPLogAck(
+                resource_id=result.job_id,
+                job_id=result.job_id,
+                compliance_status=payload["compliance"]["compliance_status"]
+            )
                 
         except Exception as e:
             print(f"❌ Error preparing MCP payload: {e}")
@@ -5,12 +5,124 @@ Detects fake precedents, articles, and statutes in LLM outputs.
 Validates references against vector store and known legal databases.
 """
 
+import os
 import re
+import hashlib
 import logging
 from typing import Dict, List, Any, Tuple, Optional
 from dataclasses import dataclass
+from functools import lru_cache
 from datetime import datetime
-import json
+
+from utils.query_cache import QueryCache
+
+from . import json_codec
+from .regex_engine import compile_pattern
+
+
+# Maximum characters of the query / output kept in an audit entry
+_LOG_QUERY_CHARS = 200
+_LOG_OUTPUT_CHARS = 500
+
+
+def _truncate(text: str, limit: int) -> str:
+    """Clip text for the audit log, marking it with '...' when shortened."""
+    if len(text) <= limit:
+        return text
+    return text[:limit] + '...'
+
+
+# Act names used on references -> KNOWN_STATUTES keys
+_ACT_MAP = {
+    'IPC': 'ipc',
+    'CrPC': 'crpc',
+    'CPC': 'cpc',
+    'IT_Act': 'it_act',
+    'Evidence_Act': 'evidence_act',
+    'Constitution': 'constitution'
+}
+
+
+# Digit runs in a citation (year, volume, page, ...)
+_DIGIT_RUN_RE = re.compile(r'\d+')
+
+
+@lru_cache(maxsize=4096)
+def _citation_numbers(citation: str) -> frozenset:
+    """Set of numbers in a citation; case and spacing don't affect them."""
+    return frozenset(_DIGIT_RUN_RE.findall(citation))
+
+
+def _copy_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy a detect_hallucinations result, including each suspected reference dict."""
+    copied = dict(result)
+    copied['suspected_fake_refs'] = [dict(ref) for ref in result['suspected_fake_refs']]
+    return copied
+
+
+def _leading_int(section: str) -> Optional[int]:
+    """Parse the leading section number (e.g. 498 from "498A"), or None if there is none."""
+    i = 0
+    n = len(section)
+    while i < n and section[i].isdecimal():
+        i += 1
+    return int(section[:i]) if i else None
+
+
+def _compile_reference_patterns(patterns: Dict[str, List[str]]) -> Tuple[Any, Dict[str, Tuple[str, str]]]:
+    """
+    Fuse all reference patterns into one alternation so text is scanned once.
+    
+    Each pattern becomes a named group (e.g. ipc_section_0) and its section
+    capture is renamed to <group>_sec so names stay unique.
+    
+    Returns:
+        Tuple of (compiled pattern, {group name: (category, section group name)})
+    """
+    alternatives = []
+    groups = {}
+    for category, category_patterns in patterns.items():
+        for i, pattern in enumerate(category_patterns):
+            name = f"{category}_{i}"
+            section_group = f"{name}_sec"
+            pattern = re.sub(r'(?<!\\)\((?!\?)', f'(?P<{section_group}>', pattern, count=1)
+            alternatives.append(f"(?P<{name}>{pattern})")
+            groups[name] = (category, section_group)
+    return compile_pattern("|".join(alternatives)), groups
+
+
+@lru_cache(maxsize=4096)
+def _validate_statute_cached(act_name: Optional[str], section: str) -> Tuple[bool, str]:
+    """
+    Validate a section of an act against HallucinationDetector.KNOWN_STATUTES.
+    
+    The statute table is class-level and never mutated, so results can be
+    memoized; outputs tend to repeat the same sections (Section 302 IPC,
+    Article 21) many times.
+    """
+    # Map act name to statute key
+    statute_key = _ACT_MAP.get(act_name)
+    if not statute_key:
+        return True, f"Unknown act: {act_name}"
+    
+    statute_info = HallucinationDetector.KNOWN_STATUTES.get(statute_key)
+    if not statute_info:
+        return True, "Statute not in database"
+    
+    # Check special sections first (like 498A, 66A)
+    if section in statute_info['special_sections']:
+        return True, f"Valid special section {section}"
+    
+    # Parse the leading section number
+    section_num = _leading_int(section)
+    if section_num is None:
+        return False, f"Invalid section format: {section}"
+    
+    first, last = statute_info['valid_sections']
+    if first <= section_num <= last:
+        return True, f"Valid section {section_num}"
+    else:
+        return False, f"Section {section_num} does not exist in {statute_info['full_name']}"
 
 
 @dataclass
@@ -46,37 +158,37 @@ class HallucinationDetector:
     - Legal provisions
     """
     
-    # Known Indian legal statutes with valid section ranges
+    # Known Indian legal statutes with valid (first, last) section ranges
     KNOWN_STATUTES = {
         'ipc': {
             'full_name': 'Indian Penal Code, 1860',
-            'valid_sections': set(range(1, 512)),  # Sections 1-511
-            'special_sections': ['498A', '376A', '376B', '376C', '376D']
+            'valid_sections': (1, 511),  # Sections 1-511
+            'special_sections': frozenset({'498A', '376A', '376B', '376C', '376D'})
         },
         'crpc': {
             'full_name': 'Code of Criminal Procedure, 1973',
-            'valid_sections': set(range(1, 485)),  # Sections 1-484
-            'special_sections': []
+            'valid_sections': (1, 484),  # Sections 1-484
+            'special_sections': frozenset()
         },
         'cpc': {
             'full_name': 'Code of Civil Procedure, 1908',
-            'valid_sections': set(range(1, 159)),  # Sections 1-158
-            'special_sections': []
+            'valid_sections': (1, 158),  # Sections 1-158
+            'special_sections': frozenset()
         },
         'it_act': {
             'full_name': 'Information Technology Act, 2000',
-            'valid_sections': set(range(1, 88)),  # Sections 1-87
-            'special_sections': ['66A', '66B', '66C', '66D', '66E', '66F']
+            'valid_sections': (1, 87),  # Sections 1-87
+            'special_sections': frozenset({'66A', '66B', '66C', '66D', '66E', '66F'})
         },
         'evidence_act': {
             'full_name': 'Indian Evidence Act, 1872',
-            'valid_sections': set(range(1, 168)),  # Sections 1-167
-            'special_sections': []
+            'valid_sections': (1, 167),  # Sections 1-167
+            'special_sections': frozenset()
         },
         'constitution': {
             'full_name': 'Constitution of India',
-            'valid_sections': set(range(1, 396)),  # Articles 1-395
-            'special_sections': ['12A', '21A', '35A', '51A', '371A', '371B']
+            'valid_sections': (1, 395),  # Articles 1-395
+            'special_sections': frozenset({'12A', '21A', '35A', '51A', '371A', '371B'})
         }
     }
     
@@ -109,6 +221,23 @@ class HallucinationDetector:
         ],
     }
     
+    # (ref_type, act_name) for each REFERENCE_PATTERNS category
+    REFERENCE_TYPES = {
+        'case_citation': ('case', None),
+        'ipc_section': ('statute', 'IPC'),
+        'crpc_section': ('statute', 'CrPC'),
+        'cpc_section': ('statute', 'CPC'),
+        'article': ('article', 'Constitution'),
+        'it_act_section': ('statute', 'IT_Act'),
+    }
+    
+    # Result cache limits (verdicts expire so vector store updates are picked up)
+    CACHE_MAX_ENTRIES = 1024
+    CACHE_TTL_SECONDS = 600
+    
+    # All patterns fused into one regex, compiled once at import
+    REFERENCE_REGEX, REFERENCE_GROUPS = _compile_reference_patterns(REFERENCE_PATTERNS)
+    
     def __init__(self, retriever=None, log_file: str = "security/logs/hallucination_audit.log"):
         """
         Initialize Hallucination Detector.
@@ -119,14 +248,23 @@ class HallucinationDetector:
         """
         self.retriever = retriever
         self._setup_logging(log_file)
+        
+        # Exact-match result cache: (user_id, output digest) -> result
+        self._result_cache = QueryCache(self.CACHE_MAX_ENTRIES, self.CACHE_TTL_SECONDS)
     
     def _setup_logging(self, log_file: str):
         """Setup hallucination audit logging."""
         self.logger = logging.getLogger('LexiQ.Hallucination')
         self.logger.setLevel(logging.INFO)
         
+        # The logger is process-wide; attach each log file only once so that
+        # creating detectors per request doesn't leak handlers and file descriptors
+        log_path = os.path.abspath(log_file)
+        if any(getattr(handler, 'baseFilename', None) == log_path
+               for handler in self.logger.handlers):
+            return
+        
         try:
-            import os
             os.makedirs(os.path.dirname(log_file), exist_ok=True)
             file_handler = logging.FileHandler(log_file)
             file_handler.setLevel(logging.INFO)
@@ -151,79 +289,24 @@ class HallucinationDetector:
         """
         references = []
         
-        # Extract case citations
-        for pattern in self.REFERENCE_PATTERNS['case_citation']:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
+        # Single pass over the text; the matching alternative names the reference kind
+        for match in self.REFERENCE_REGEX.finditer(text):
+            category, section_group = self.REFERENCE_GROUPS[match.lastgroup]
+            ref_type, act_name = self.REFERENCE_TYPES[category]
+            
+            if ref_type == 'case':
                 references.append(Reference(
                     ref_type='case',
                     text=match.group(0),
                     citation=match.group(0),
                     position=match.start()
                 ))
-        
-        # Extract IPC sections
-        for pattern in self.REFERENCE_PATTERNS['ipc_section']:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
-                section = match.group(1) if match.lastindex >= 1 else None
-                references.append(Reference(
-                    ref_type='statute',
-                    text=match.group(0),
-                    section=section,
-                    act_name='IPC',
-                    position=match.start()
-                ))
-        
-        # Extract CrPC sections
-        for pattern in self.REFERENCE_PATTERNS['crpc_section']:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
-                section = match.group(1) if match.lastindex >= 1 else None
-                references.append(Reference(
-                    ref_type='statute',
-                    text=match.group(0),
-                    section=section,
-                    act_name='CrPC',
-                    position=match.start()
-                ))
-        
-        # Extract CPC sections
-        for pattern in self.REFERENCE_PATTERNS['cpc_section']:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
-                section = match.group(1) if match.lastindex >= 1 else None
-                references.append(Reference(
-                    ref_type='statute',
-                    text=match.group(0),
-                    section=section,
-                    act_name='CPC',
-                    position=match.start()
-                ))
-        
-        # Extract Articles
-        for pattern in self.REFERENCE_PATTERNS['article']:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
-                article_num = match.group(1)
-                references.append(Reference(
-                    ref_type='article',
-                    text=match.group(0),
-                    section=article_num,
-                    act_name='Constitution',
-                    position=match.start()
-                ))
-        
-        # Extract IT Act sections
-        for pattern in self.REFERENCE_PATTERNS['it_act_section']:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
-                section = match.group(1) if match.lastindex >= 1 else None
+            else:
                 references.append(Reference(
-                    ref_type='statute',
+                    ref_type=ref_type,
                     text=match.group(0),
-                    section=section,
-                    act_name='IT_Act',
+                    section=match.group(section_group),
+                    act_name=act_name,
                     position=match.start()
                 ))
         
@@ -245,47 +328,18 @@ class HallucinationDetector:
         if not reference.section:
             return True, "No section to validate"
         
-        # Map act name to statute key
-        act_map = {
-            'IPC': 'ipc',
-            'CrPC': 'crpc',
-            'CPC': 'cpc',
-            'IT_Act': 'it_act',
-            'Evidence_Act': 'evidence_act',
-            'Constitution': 'constitution'
-        }
-        
-        statute_key = act_map.get(reference.act_name)
-        if not statute_key:
-            return True, f"Unknown act: {reference.act_name}"
-        
-        statute_info = self.KNOWN_STATUTES.get(statute_key)
-        if not statute_info:
-            return True, "Statute not in database"
-        
-        # Check if section is valid
-        section_str = reference.section
-        
-        # Check special sections first (like 498A, 66A)
-        if section_str in statute_info['special_sections']:
-            return True, f"Valid special section {section_str}"
-        
-        # Try to parse as integer
-        try:
-            section_num = int(re.match(r'\d+', section_str).group())
-            if section_num in statute_info['valid_sections']:
-                return True, f"Valid section {section_num}"
-            else:
-                return False, f"Section {section_num} does not exist in {statute_info['full_name']}"
-        except:
-            return False, f"Invalid section format: {section_str}"
+        return _validate_statute_cached(reference.act_name, reference.section)
     
-    def validate_case_citation(self, reference: Reference) -> Tuple[bool, str]:
+    def validate_case_citation(self,
+                               reference: Reference,
+                               candidates: Optional[List[Any]] = None) -> Tuple[bool, str]:
         """
         Validate a case citation against vector store.
         
         Args:
             reference: Reference object
+            candidates: Pre-fetched vector store results for this citation
+                (searched here if not provided)
             
         Returns:
             Tuple of (is_valid, reason)
@@ -298,12 +352,13 @@ class HallucinationDetector:
         
         # Search vector store for this citation
         try:
-            results = self.retriever.retrieve(reference.citation, k=3)
+            results = candidates if candidates is not None else self.retriever.retrieve(reference.citation, k=3)
             
             # Check if any result matches the citation
+            ref_numbers = _citation_numbers(reference.citation)
             for result in results:
                 result_citation = result.metadata.get('citation', '')
-                if self._citations_match(reference.citation, result_citation):
+                if self._numbers_match(ref_numbers, _citation_numbers(result_citation)):
                     return True, f"Found in vector store: {result_citation}"
             
             return False, "Citation not found in vector store"
@@ -311,16 +366,33 @@ class HallucinationDetector:
         except Exception as e:
             return True, f"Error validating: {str(e)}"
     
-    def _citations_match(self, citation1: str, citation2: str) -> bool:
-        """Check if two citations match (fuzzy)."""
-        # Normalize citations
-        c1 = re.sub(r'\s+', ' ', citation1.lower().strip())
-        c2 = re.sub(r'\s+', ' ', citation2.lower().strip())
+    def _prefetch_case_candidates(self, references: List[Reference]) -> Dict[str, List[Any]]:
+        """
+        Search the vector store for every distinct case citation in one batch.
         
-        # Extract key numbers
-        nums1 = set(re.findall(r'\d+', c1))
-        nums2 = set(re.findall(r'\d+', c2))
+        Args:
+            references: Extracted references
+            
+        Returns:
+            Dictionary mapping citation to its top-3 results (empty if unavailable)
+        """
+        citations = list(dict.fromkeys(r.citation for r in references if r.ref_type == 'case'))
+        if not citations or not self.retriever or not hasattr(self.retriever, 'retrieve_batch'):
+            return {}
         
+        try:
+            return dict(zip(citations, self.retriever.retrieve_batch(citations, k=3)))
+        except Exception as e:
+            print(f"Warning: Batched citation lookup failed, validating individually: {e}")
+            return {}
+    
+    def _citations_match(self, citation1: str, citation2: str) -> bool:
+        """Check if two citations match (fuzzy)."""
+        return self._numbers_match(_citation_numbers(citation1), _citation_numbers(citation2))
+    
+    @staticmethod
+    def _numbers_match(nums1: frozenset, nums2: frozenset) -> bool:
+        """Check if most key numbers of two citations agree."""
         # If most numbers match, consider it a match
         if nums1 and nums2:
             overlap = len(nums1 & nums2) / max(len(nums1), len(nums2))
@@ -331,7 +403,8 @@ class HallucinationDetector:
     def detect_hallucinations(self, 
                              input_query: str,
                              output_text: str,
-                             user_id: Optional[str] = None) -> Dict[str, Any]:
+                             user_id: Optional[str] = None,
+                             cache: bool = True) -> Dict[str, Any]:
         """
         Main method to detect hallucinations in LLM output.
         
@@ -339,10 +412,44 @@ class HallucinationDetector:
             input_query: Original user query
             output_text: LLM generated output
             user_id: Optional user identifier
+            cache: Reuse the result for an identical output from the same user
+                (set False for sensitive prompts)
             
         Returns:
             Dictionary with hallucination detection results
         """
+        cache_key = None
+        if cache:
+            digest = hashlib.blake2b(output_text.encode('utf-8'), digest_size=16).digest()
+            cache_key = (user_id, digest)
+            cached = self._result_cache.get(cache_key)
+            if cached is not None:
+                # Callers get their own copy so edits never reach the cache
+                result = _copy_result(cached)
+                
+                # Repeated outputs are still audited
+                if result['has_hallucinations']:
+                    self._log_hallucination(
+                        input_query=input_query,
+                        output_text=output_text,
+                        suspected_fakes=result['suspected_fake_refs'],
+                        confidence_score=result['confidence_score'],
+                        user_id=user_id
+                    )
+                return result
+        
+        result = self._analyze_output(input_query, output_text, user_id)
+        
+        if cache_key is not None:
+            self._result_cache.put(cache_key, result)
+        
+        return _copy_result(result)
+    
+    def _analyze_output(self,
+                        input_query: str,
+                        output_text: str,
+                        user_id: Optional[str]) -> Dict[str, Any]:
+        """Extract and validate all references in an output (uncached path)."""
         # Extract references
         references = self.extract_references(output_text)
         
@@ -355,12 +462,13 @@ class HallucinationDetector:
                 'summary': 'No references found to validate'
             }
         
-        # Validate each reference
+        # Validate each reference (case citations share one batched search)
         hallucination_results = []
+        case_candidates = self._prefetch_case_candidates(references)
         
         for ref in references:
             if ref.ref_type == 'case':
-                validated_index, reason = self.validate_case_citation(ref)
+                validated_index, reason = self.validate_case_citation(ref, case_candidates.get(ref.citation))
                 matched_statute = False
             else:
                 matched_statute, reason = self.validate_statute(ref)
@@ -445,16 +553,19 @@ class HallucinationDetector:
                           confidence_score: float,
                           user_id: Optional[str]):
         """Log suspected hallucination."""
+        if not self.logger.isEnabledFor(logging.WARNING):
+            return
+        
         log_entry = {
             'timestamp': datetime.now().isoformat(),
             'user_id': user_id or 'anonymous',
             'suspected_hallucination': True,
-            'input_query': input_query[:200] + '...' if len(input_query) > 200 else input_query,
-            'output_text': output_text[:500] + '...' if len(output_text) > 500 else output_text,
+            'input_query': _truncate(input_query, _LOG_QUERY_CHARS),
+            'output_text': _truncate(output_text, _LOG_OUTPUT_CHARS),
             'suspected_fake_refs': suspected_fakes,
             'confidence_score': confidence_score,
             'num_suspected': len(suspected_fakes)
         }
         
-        self.logger.warning(json.dumps(log_entry))
+        self.logger.warning(json_codec.dumps(log_entry))
 
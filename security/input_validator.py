@@ -8,6 +8,21 @@ import re
 from typing import Dict, Any, List, Tuple
 from dataclasses import dataclass
 
+from .regex_engine import (
+    build_literal_prefilter, build_union_set, compile_pattern, compile_union, fold_case
+)
+
+
+# Characters counted as "special" by _has_excessive_special_chars
+_SPECIAL_CHAR_RE = re.compile(r'[^\w\s.,;:!?()\[\]{}\-\'\"\/]')
+
+# Translation table deleting every non-special ASCII character
+_NON_SPECIAL_ASCII = {c: None for c in range(128) if not _SPECIAL_CHAR_RE.match(chr(c))}
+
+# Patterns stripped by _sanitize_text
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+_JAVASCRIPT_RE = re.compile(r'javascript:', re.IGNORECASE)
+
 
 @dataclass
 class ValidationResult:
@@ -72,12 +87,47 @@ class InputValidator:
         r'/\*.*\*/',
     ]
     
+    # Every pattern above requires at least one of these literals (compared
+    # case-folded), so text containing none of them cannot match any pattern
+    PATTERN_ANCHORS = [
+        # Prompt injection
+        'ignore', 'disregard', 'forget', 'you', 'instruction', 'system', 'admin',
+        'jailbreak', 'mode', 'override', 'void',
+        # XSS
+        '<script', 'javascript:', 'onerror', 'onload', '<iframe', '<embed', '<object',
+        # SQL
+        'drop', 'delete', 'select', '--', '/*',
+    ]
+    
+    # Compiled once (with RE2 when available) instead of on every check
+    COMPILED_PROMPT_INJECTION_PATTERNS = [compile_pattern(p) for p in PROMPT_INJECTION_PATTERNS]
+    COMPILED_XSS_PATTERNS = [compile_pattern(p) for p in XSS_PATTERNS]
+    COMPILED_SQL_PATTERNS = [compile_pattern(p) for p in SQL_PATTERNS]
+    
+    # One alternation per category: clean text is rejected in a single scan
+    PROMPT_INJECTION_UNION = compile_union(PROMPT_INJECTION_PATTERNS)
+    XSS_UNION = compile_union(XSS_PATTERNS)
+    SQL_UNION = compile_union(SQL_PATTERNS)
+    _contains_anchor = staticmethod(build_literal_prefilter(PATTERN_ANCHORS))
+    
+    # Indices of the pattern groups in _matching_pattern_groups
+    PROMPT_INJECTION_GROUP, XSS_GROUP, SQL_GROUP = ALL_PATTERN_GROUPS = (0, 1, 2)
+    
+    # With RE2, all three groups are checked in one scan of ASCII text, which
+    # is cheaper than even the literal prefilter; None without RE2
+    _matching_pattern_groups = staticmethod(
+        build_union_set([PROMPT_INJECTION_PATTERNS, XSS_PATTERNS, SQL_PATTERNS])
+    )
+    
     def __init__(self, strict_mode: bool = True):
         """
         Initialize Input Validator.
         
         Args:
-            strict_mode: Whether to apply strict validation rules
+            strict_mode: Whether to apply strict validation rules. Non-strict
+                mode only checks length and prompt injection and skips the
+                XSS/SQL/special-character checks and HTML stripping; use it
+                only for server-generated or otherwise trusted text.
         """
         self.strict_mode = strict_mode
     
@@ -94,40 +144,67 @@ class InputValidator:
         violations = []
         risk_score = 0.0
         
-        # Check length
-        if len(text) > self.MAX_TEXT_LENGTH:
-            violations.append(f"Text exceeds maximum length of {self.MAX_TEXT_LENGTH} characters")
-            risk_score += 0.3
-        
-        if len(text) < self.MIN_TEXT_LENGTH:
-            violations.append(f"Text too short (minimum {self.MIN_TEXT_LENGTH} characters)")
-            risk_score += 0.2
+        # Check length first: out-of-range text is rejected without any
+        # regex scan or sanitization (oversized bodies are a cheap DoS vector)
+        length = len(text)
+        if length > self.MAX_TEXT_LENGTH:
+            return ValidationResult(
+                is_valid=False,
+                sanitized_input="",
+                violations=[f"Text exceeds maximum length of {self.MAX_TEXT_LENGTH} characters"],
+                risk_score=0.3
+            )
+        
+        if length < self.MIN_TEXT_LENGTH:
+            return ValidationResult(
+                is_valid=False,
+                sanitized_input="",
+                violations=[f"Text too short (minimum {self.MIN_TEXT_LENGTH} characters)"],
+                risk_score=0.2
+            )
+        
+        # Pattern groups that can match: a single RE2 set scan names them
+        # (ASCII text only); otherwise the literal prefilter rules all of
+        # them in or out
+        if self._matching_pattern_groups is not None and text.isascii():
+            groups = self._matching_pattern_groups(text)
+        elif self._contains_anchor(fold_case(text)):
+            groups = self.ALL_PATTERN_GROUPS
+        else:
+            groups = ()
         
         # Check for prompt injection
-        injection_found, injection_details = self._check_prompt_injection(text)
-        if injection_found:
-            violations.append(f"Potential prompt injection detected: {injection_details}")
-            risk_score += 0.5
-        
-        # Check for XSS
-        xss_found, xss_details = self._check_xss(text)
-        if xss_found:
-            violations.append(f"Potential XSS attack detected: {xss_details}")
-            risk_score += 0.4
+        if self.PROMPT_INJECTION_GROUP in groups:
+            injection_found, injection_details = self._check_prompt_injection(text)
+            if injection_found:
+                violations.append(f"Potential prompt injection detected: {injection_details}")
+                risk_score += 0.5
         
-        # Check for SQL injection patterns (defensive, though we don't use SQL)
-        sql_found, sql_details = self._check_sql_injection(text)
-        if sql_found:
-            violations.append(f"SQL injection pattern detected: {sql_details}")
-            risk_score += 0.3
+        if self.strict_mode:
+            # Check for XSS
+            if self.XSS_GROUP in groups:
+                xss_found, xss_details = self._check_xss(text)
+                if xss_found:
+                    violations.append(f"Potential XSS attack detected: {xss_details}")
+                    risk_score += 0.4
+            
+            # Check for SQL injection patterns (defensive, though we don't use SQL)
+            if self.SQL_GROUP in groups:
+                sql_found, sql_details = self._check_sql_injection(text)
+                if sql_found:
+                    violations.append(f"SQL injection pattern detected: {sql_details}")
+                    risk_score += 0.3
         
         # Check character distribution
-        if self._has_excessive_special_chars(text):
+        if self.strict_mode and self._has_excessive_special_chars(text):
             violations.append("Excessive special characters detected")
             risk_score += 0.2
         
-        # Sanitize input
-        sanitized = self._sanitize_text(text)
+        # Sanitize input (trusted text only needs whitespace normalized)
+        if self.strict_mode:
+            sanitized = self._sanitize_text(text)
+        else:
+            sanitized = ' '.join(text.split())
         
         # Determine validity
         is_valid = risk_score < 0.5 and len(violations) == 0
@@ -141,40 +218,64 @@ class InputValidator:
     
     def _check_prompt_injection(self, text: str) -> Tuple[bool, str]:
         """Check for prompt injection attempts."""
-        text_lower = text.lower()
-        
-        for pattern in self.PROMPT_INJECTION_PATTERNS:
-            match = re.search(pattern, text_lower, re.IGNORECASE)
-            if match:
-                return True, f"Pattern '{pattern}' found"
+        # Patterns are compiled case-insensitive, so no lowered copy is needed
+        regex = self._first_matching_pattern(
+            text, self.PROMPT_INJECTION_UNION, self.COMPILED_PROMPT_INJECTION_PATTERNS
+        )
+        if regex is not None:
+            return True, f"Pattern '{regex.pattern}' found"
         
         return False, ""
     
     def _check_xss(self, text: str) -> Tuple[bool, str]:
         """Check for XSS attempts."""
-        for pattern in self.XSS_PATTERNS:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                return True, f"XSS pattern '{pattern}' found"
+        regex = self._first_matching_pattern(text, self.XSS_UNION, self.COMPILED_XSS_PATTERNS)
+        if regex is not None:
+            return True, f"XSS pattern '{regex.pattern}' found"
         
         return False, ""
     
     def _check_sql_injection(self, text: str) -> Tuple[bool, str]:
         """Check for SQL injection patterns."""
-        for pattern in self.SQL_PATTERNS:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                return True, f"SQL pattern '{pattern}' found"
+        regex = self._first_matching_pattern(text, self.SQL_UNION, self.COMPILED_SQL_PATTERNS)
+        if regex is not None:
+            return True, f"SQL pattern '{regex.pattern}' found"
         
         return False, ""
     
+    @staticmethod
+    def _first_matching_pattern(text: str, union, compiled_patterns: List):
+        """
+        Find the first pattern (in list order) that matches text.
+        
+        Args:
+            text: Text to scan
+            union: Alternation of all the patterns
+            compiled_patterns: The individual compiled patterns
+            
+        Returns:
+            The matching compiled pattern, or None if nothing matches
+        """
+        if not union.search(text):
+            return None
+        
+        # Rare hit path: name the same pattern the per-pattern loop reported
+        for regex in compiled_patterns:
+            if regex.search(text):
+                return regex
+        return None
+    
     def _has_excessive_special_chars(self, text: str) -> bool:
         """Check if text has excessive special characters."""
         if not text:
             return False
         
-        # Count special characters
-        special_chars = len(re.findall(r'[^\w\s.,;:!?()\[\]{}\-\'\"\/]', text))
+        # Count special characters (ASCII text: whatever survives deleting
+        # the non-special characters, which str.translate does in C)
+        if text.isascii():
+            special_chars = len(text.translate(_NON_SPECIAL_ASCII))
+        else:
+            special_chars = len(_SPECIAL_CHAR_RE.findall(text))
         ratio = special_chars / len(text)
         
         # More than 20% special chars is suspicious
@@ -192,19 +293,17 @@ class InputValidator:
         """
         sanitized = text
         
-        # Remove HTML tags
-        sanitized = re.sub(r'<[^>]+>', '', sanitized)
-        
-        # Remove JavaScript
-        sanitized = re.sub(r'javascript:', '', sanitized, flags=re.IGNORECASE)
-        
-        # Remove excessive whitespace
-        sanitized = re.sub(r'\s+', ' ', sanitized)
+        # Remove HTML tags (skipped when there is no '<' at all)
+        if '<' in sanitized:
+            sanitized = _HTML_TAG_RE.sub('', sanitized)
         
-        # Trim
-        sanitized = sanitized.strip()
+        # Remove JavaScript (returns the same string when nothing matches)
+        sanitized = _JAVASCRIPT_RE.sub('', sanitized)
         
-        return sanitized
+        # Collapse whitespace runs to single spaces and trim, in one split/join
+        # (same whitespace set as \s). This has to stay last: the removals
+        # above can leave separate runs next to each other.
+        return ' '.join(sanitized.split())
     
     def validate_file_upload(self, filename: str, file_size_bytes: int, content_type: str) -> ValidationResult:
         """
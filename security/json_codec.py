@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+JSON Codec
+Serializes audit entries and API payloads with orjson when it is installed.
+
+orjson is several times faster than the json module and writes datetimes
+itself in isoformat() form; without it, the json module is used and
+datetimes are converted with isoformat() as well.
+"""
+
+import json
+from datetime import datetime
+from typing import Any, Union
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def dumps(obj: Any) -> str:
+    """Serialize obj to a JSON string."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj).decode('utf-8')
+    return json.dumps(obj, default=datetime.isoformat)
+
+
+def dumps_bytes(obj: Any) -> bytes:
+    """Serialize obj to UTF-8 encoded JSON (e.g. for a request body)."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj)
+    return json.dumps(obj, default=datetime.isoformat).encode('utf-8')
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Parse JSON from UTF-8 bytes or a string."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -5,13 +5,142 @@ Detects and redacts Personally Identifiable Information while maintaining contex
 Uses placeholders to preserve semantic meaning for LLM processing.
 """
 
+import os
 import re
+import atexit
 import hashlib
+import threading
 import uuid
 import time
-from typing import Dict, List, Tuple, Any
+from typing import Dict, List, Tuple, Any, Optional, Union
 from dataclasses import dataclass
 from datetime import datetime, timezone
+from functools import lru_cache
+
+from utils.query_cache import QueryCache
+
+from . import json_codec
+from .regex_engine import (
+    POSSESSIVE_SUPPORTED, build_literal_prefilter, build_pattern_set, fold_case, strip_possessive
+)
+
+# PII audit log, one JSON entry per line
+PII_AUDIT_LOG = 'security/logs/pii_audit.log'
+
+# Audit log handles shared by all redactors: absolute path -> line-buffered
+# file. Kept open instead of reopened per entry; line buffering still puts
+# each entry on disk as it is written, so readers see it right away.
+_audit_files = {}
+_audit_lock = threading.Lock()
+
+
+def _append_audit_line(log_file: str, line: str):
+    """Append one line to an audit log, opening it on first use."""
+    log_path = os.path.abspath(log_file)
+    with _audit_lock:
+        audit_file = _audit_files.get(log_path)
+        if audit_file is None or audit_file.closed:
+            os.makedirs(os.path.dirname(log_path), exist_ok=True)
+            audit_file = open(log_path, 'a', buffering=1, encoding='utf-8')
+            _audit_files[log_path] = audit_file
+        audit_file.write(line)
+
+
+@atexit.register
+def _close_audit_files():
+    """Close the shared audit log handles at interpreter exit."""
+    with _audit_lock:
+        for audit_file in _audit_files.values():
+            audit_file.close()
+        _audit_files.clear()
+
+
+def _compile_pii_patterns(patterns: Dict[str, List[str]],
+                          priority: Tuple[str, ...],
+                          leading_chars: Dict[str, str],
+                          include: Optional[frozenset] = None) -> Tuple[Any, Dict[str, str]]:
+    """
+    Fuse all PII patterns into one alternation so text is scanned once.
+    
+    Each pattern becomes a named group (e.g. phone_0). Where several patterns
+    match at the same position, the PII type listed first in priority wins.
+    
+    Consecutive alternatives sharing a cheap leading check are grouped behind
+    it, so most positions are rejected with one check instead of one per
+    pattern: a leading word-boundary assertion is factored out, and patterns
+    of a type listed in leading_chars are gated by a lookahead on the
+    characters they can start with. Without this the fused scan is slower
+    than running the patterns separately.
+    
+    Args:
+        patterns: {PII type: list of regular expressions}
+        priority: PII types in the order they claim overlapping matches
+        leading_chars: {PII type: character class its patterns start with}
+        include: Group names to keep (default: all patterns)
+    
+    Returns:
+        Tuple of (compiled pattern, {group name: PII type})
+    """
+    runs = []  # [(leading check, [alternatives])]
+    groups = {}
+    
+    for pii_type in priority:
+        for i, pattern in enumerate(patterns[pii_type]):
+            name = f"{pii_type}_{i}"
+            if include is not None and name not in include:
+                continue
+            groups[name] = pii_type
+            
+            if pattern.startswith(r"\b"):
+                check, pattern = r"\b", pattern[2:]
+            elif pii_type in leading_chars:
+                check = f"(?={leading_chars[pii_type]})"
+            else:
+                check = ""
+            
+            alternative = f"(?P<{name}>{pattern})"
+            if runs and runs[-1][0] == check:
+                runs[-1][1].append(alternative)
+            else:
+                runs.append((check, [alternative]))
+    
+    alternatives = [
+        f"{check}(?:{'|'.join(run)})" if check else "|".join(run)
+        for check, run in runs
+    ]
+    regex = "|".join(alternatives)
+    if not POSSESSIVE_SUPPORTED:
+        regex = strip_possessive(regex)
+    return re.compile(regex), groups
+
+
+@lru_cache(maxsize=64)
+def _compile_pii_subset(group_names: frozenset) -> Any:
+    """Fused PIIRedactor regex restricted to the given pattern group names."""
+    regex, _ = _compile_pii_patterns(
+        PIIRedactor.PATTERNS,
+        PIIRedactor.MATCH_PRIORITY,
+        PIIRedactor.PATTERN_LEADING_CHARS,
+        include=group_names
+    )
+    return regex
+
+
+def _copy_redaction(result: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Copy a redact() result down to its nested lists and dicts.
+    
+    Cached results are handed out as copies, so a caller editing
+    placeholder_map or redaction_details can't change what later
+    callers get for the same text.
+    """
+    copied = dict(result)
+    copied['pii_types_detected'] = list(result['pii_types_detected'])
+    copied['placeholder_map'] = {
+        placeholder: dict(entry) for placeholder, entry in result['placeholder_map'].items()
+    }
+    copied['redaction_details'] = [dict(detail) for detail in result['redaction_details']]
+    return copied
 
 
 @dataclass
@@ -23,6 +152,7 @@ class PIIDetection:
     start_pos: int
     end_pos: int
     confidence: float
+    value_hash: str = ""  # SHA-256 hex digest of original_value
 
 
 @dataclass
@@ -52,7 +182,10 @@ class PIIRedactor:
     - Addresses (partial detection)
     """
     
-    # Regex patterns for PII detection
+    # Regex patterns for PII detection. Possessive quantifiers (++) mark
+    # runs that can't end anywhere else - a lowercase run must stop before
+    # whitespace or a word boundary, a local part at '@' - so failed
+    # candidates are rejected without backtracking through them.
     PATTERNS = {
         'phone': [
             r'\+?91[-\s]?\d{10}',  # Indian format: +91-9876543210
@@ -60,7 +193,7 @@ class PIIRedactor:
             r'\(\d{3}\)\s?\d{3}[-\s]?\d{4}',  # (123) 456-7890
         ],
         'email': [
-            r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',
+            r'\b[A-Za-z0-9._%+-]++@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',
         ],
         'aadhaar': [
             r'\b\d{4}[-\s]?\d{4}[-\s]?\d{4}\b',  # 1234-5678-9012
@@ -74,12 +207,109 @@ class PIIRedactor:
         ],
         'person_name': [
             # Indian name patterns (Title + Name)
-            r'\b(?:Mr\.|Mrs\.|Ms\.|Dr\.|Justice|Hon\'?ble)\s+[A-Z][a-z]+(?:\s+[A-Z][a-z]+)+\b',
+            r'\b(?:Mr\.|Mrs\.|Ms\.|Dr\.|Justice|Hon\'?ble)\s++[A-Z][a-z]++(?:\s++[A-Z][a-z]++)+\b',
             # Full name pattern (2-4 words, capitalized)
-            r'\b[A-Z][a-z]+\s+[A-Z][a-z]+(?:\s+[A-Z][a-z]+)?\b',
+            r'\b[A-Z][a-z]++\s++[A-Z][a-z]++(?:\s++[A-Z][a-z]++)?\b',
         ],
     }
     
+    # Order in which overlapping matches are claimed: specific formats
+    # first, so e.g. a 12-digit Aadhaar isn't split into a phone number,
+    # and bank_account (below the default confidence cutoff) last. Names
+    # and phone numbers never start on the same character, so person_name
+    # sits next to the other word-boundary patterns.
+    MATCH_PRIORITY = ('email', 'aadhaar', 'pan', 'person_name', 'phone', 'bank_account')
+    
+    # Characters each pattern of a type can start with (types whose patterns
+    # all begin with a word boundary don't need an entry)
+    PATTERN_LEADING_CHARS = {
+        'phone': r'[+(\d]',
+    }
+    
+    # All patterns fused into one regex, compiled once at import
+    PII_REGEX, PII_GROUPS = _compile_pii_patterns(PATTERNS, MATCH_PRIORITY, PATTERN_LEADING_CHARS)
+    
+    # RE2 pattern set telling in one DFA pass which patterns occur in ASCII
+    # text at all (None without google-re2); see _select_regex
+    PII_GROUP_NAMES = [f"{pii_type}_{i}" for pii_type, patterns in PATTERNS.items() for i in range(len(patterns))]
+    PII_PATTERN_SET = staticmethod(build_pattern_set(
+        pattern for patterns in PATTERNS.values() for pattern in patterns
+    ))
+    
+    # Every pattern needs a digit, an '@' or a capitalized word; text with
+    # none of them (lowercase prose, headers, code) is not scanned at all.
+    # Email patterns also need the '@' itself. (Two plain searches are
+    # faster than one r'[\d@]|[A-Z][a-z]' alternation.)
+    DIGIT_PATTERN = re.compile(r'\d')
+    CAPITALIZED_PATTERN = re.compile(r'[A-Z][a-z]')
+    EMAIL_GROUP_NAMES = frozenset(f"email_{i}" for i in range(len(PATTERNS['email'])))
+    
+    # Lowercase terms marking a person_name match as a legal term, entity or
+    # section header rather than a person
+    FALSE_POSITIVE_TERMS = [
+        # Legal terms
+        'supreme court', 'high court', 'civil appeal', 'criminal appeal',
+        'state of', 'union of', 'petitioner', 'respondent', 'appellant',
+        # Government entities
+        'state government', 'central government', 'union government',
+        'government of', 'ministry of',
+        # Common legal entities
+        'company', 'corporation', 'platform', 'limited', 'ltd',
+        'private limited', 'pvt ltd', 'public limited',
+        # Section headers
+        'legal issues', 'facts', 'arguments', 'case:', 'v.', 'vs.',
+        'background', 'issues', 'judgment', 'order', 'relief',
+        # Generic entities
+        'social media', 'bank', 'insurance', 'trust', 'society',
+    ]
+    
+    # Titles that keep a name near a false-positive term redactable
+    TITLE_TERMS = ['justice', 'mr.', 'mrs.', 'ms.', 'dr.']
+    
+    # One Aho-Corasick pass over lowercased text (when pyahocorasick is
+    # installed) instead of one substring search per term
+    _contains_skip_term = staticmethod(build_literal_prefilter(FALSE_POSITIVE_TERMS))
+    _contains_title = staticmethod(build_literal_prefilter(TITLE_TERMS))
+    
+    # Bare 9-18 digit runs are mostly years, case and section numbers, so
+    # bank_account patterns only run on text mentioning one of these
+    BANK_CONTEXT_TERMS = ['account', 'a/c', 'acct', 'ifsc', 'bank']
+    _contains_bank_context = staticmethod(build_literal_prefilter(BANK_CONTEXT_TERMS))
+    BANK_GROUP_NAMES = frozenset(f"bank_account_{i}" for i in range(len(PATTERNS['bank_account'])))
+    
+    # Base confidence per PII type
+    BASE_CONFIDENCE = {
+        'email': 0.95,  # Email regex is very reliable
+        'aadhaar': 0.90,  # Specific format
+        'pan': 0.95,  # Very specific format
+        'phone': 0.75,  # Can be confused with other numbers
+        'bank_account': 0.60,  # Often confused with case numbers
+        'person_name': 0.70,  # Name detection is tricky
+    }
+    
+    # Compliance logging backends for redact_with_compliance: name -> method
+    COMPLIANCE_BACKENDS = {
+        'vanta': '_log_to_vanta',
+        'mcp': '_log_to_vanta_mcp',
+        'audit': '_log_to_audit_trail',
+    }
+    
+    # Placeholder label per PII type: [LABEL_<count>_<hash prefix>]
+    PLACEHOLDER_PREFIXES = {
+        'phone': 'PHONE',
+        'email': 'EMAIL',
+        'aadhaar': 'AADHAAR',
+        'pan': 'PAN',
+        'bank_account': 'BANK_ACCOUNT',
+        'person_name': 'PERSON',
+    }
+    
+    # Maximum number of redaction results kept in detection_cache
+    CACHE_MAX_ENTRIES = 1024
+    
+    # Four-digit years, which are never bank account numbers
+    YEAR_PATTERN = re.compile(r'\b(19|20)\d{2}\b')
+    
     def __init__(self, enable_logging: bool = True):
         """
         Initialize PII Redactor.
@@ -88,7 +318,8 @@ class PIIRedactor:
             enable_logging: Whether to enable detailed logging
         """
         self.enable_logging = enable_logging
-        self.detection_cache = {}  # Cache for placeholder mappings
+        # Redaction results keyed by (SHA-256 of text, min_confidence); see redact
+        self.detection_cache = QueryCache(self.CACHE_MAX_ENTRIES)
         
         # Initialize Vanta client if credentials are available
         self.vanta_client = None
@@ -114,77 +345,157 @@ class PIIRedactor:
                 print("⚠️ Vanta integration not available - install integrations module")
             except Exception as e:
                 print(f"⚠️ Vanta client initialization failed: {e}")
-        self.counter = {'phone': 0, 'email': 0, 'aadhaar': 0, 'pan': 0, 
-                       'bank_account': 0, 'person_name': 0}
+        # Placeholders issued per PII type in the current redaction
+        self.counter = dict.fromkeys(self.PATTERNS, 0)
     
-    def _generate_placeholder(self, pii_type: str, original_value: str) -> str:
+    def _generate_placeholder(self, pii_type: str, original_value: str, value_hash: str = None) -> str:
         """
         Generate a consistent placeholder for PII.
         
         Args:
             pii_type: Type of PII (phone, email, etc.)
             original_value: Original PII value
+            value_hash: SHA-256 hex digest of original_value, if already computed
             
         Returns:
             Placeholder string
         """
         # Use hash to ensure same value always gets same placeholder
-        value_hash = hashlib.sha256(original_value.encode()).hexdigest()[:8]
-        
-        self.counter[pii_type] += 1
-        count = self.counter[pii_type]
-        
-        placeholders = {
-            'phone': f'[PHONE_{count}_{value_hash}]',
-            'email': f'[EMAIL_{count}_{value_hash}]',
-            'aadhaar': f'[AADHAAR_{count}_{value_hash}]',
-            'pan': f'[PAN_{count}_{value_hash}]',
-            'bank_account': f'[BANK_ACCOUNT_{count}_{value_hash}]',
-            'person_name': f'[PERSON_{count}_{value_hash}]',
-        }
+        if value_hash is None:
+            value_hash = hashlib.sha256(original_value.encode()).hexdigest()
+        value_hash = value_hash[:8]
         
-        return placeholders.get(pii_type, f'[REDACTED_{pii_type.upper()}_{count}]')
+        count = self.counter[pii_type] + 1
+        self.counter[pii_type] = count
+        
+        prefix = self.PLACEHOLDER_PREFIXES.get(pii_type)
+        if prefix is None:
+            return f'[REDACTED_{pii_type.upper()}_{count}]'
+        return f'[{prefix}_{count}_{value_hash}]'
     
-    def _detect_pii(self, text: str) -> List[PIIDetection]:
+    def _detect_pii(self, text: str, min_confidence: Optional[float] = None) -> List[PIIDetection]:
         """
         Detect all PII in text.
         
+        Overlapping candidates are resolved during the scan: the earliest
+        match wins, and among matches starting at the same position the PII
+        type listed first in MATCH_PRIORITY. No two detections overlap, so
+        each span is replaced exactly once.
+        
         Args:
             text: Input text
+            min_confidence: Drop detections below this confidence before
+                hashing them or issuing a placeholder. They still claim
+                their span, so the remaining detections are the same.
             
         Returns:
-            List of PIIDetection objects
+            List of PIIDetection objects in text order
         """
         detections = []
         
-        for pii_type, patterns in self.PATTERNS.items():
-            for pattern in patterns:
-                matches = re.finditer(pattern, text)
-                for match in matches:
-                    original_value = match.group(0)
-                    
-                    # Skip if likely not PII (context-based filtering)
-                    if self._is_false_positive(pii_type, original_value, text, match.start()):
-                        continue
-                    
-                    placeholder = self._generate_placeholder(pii_type, original_value)
-                    
-                    detection = PIIDetection(
-                        pii_type=pii_type,
-                        original_value=original_value,
-                        placeholder=placeholder,
-                        start_pos=match.start(),
-                        end_pos=match.end(),
-                        confidence=self._calculate_confidence(pii_type, original_value, text)
-                    )
-                    detections.append(detection)
-        
-        # Sort by position (reverse order for replacement)
-        detections.sort(key=lambda x: x.start_pos, reverse=True)
+        regex = self._select_regex(text)
+        if regex is None:
+            return detections
+        
+        # Single pass over the text; matches never overlap, so no span is
+        # replaced twice. The matching alternative names the PII type.
+        # (A re.sub callback can't express the resume-after-rejection rule.)
+        search = regex.search
+        groups = self.PII_GROUPS
+        is_false_positive = self._is_false_positive
+        
+        # Lowercased once for all context checks; slices line up with text
+        # unless lowering changed the length (only U+0130 does)
+        text_lower = text.lower()
+        if len(text_lower) != len(text):
+            text_lower = None
+        
+        # Each distinct value is hashed once per call; the digest serves both
+        # the placeholder and the placeholder map
+        value_hashes = {}
+        
+        pos = 0
+        while True:
+            match = search(text, pos)
+            if match is None:
+                break
+            
+            pii_type = groups[match.lastgroup]
+            original_value = match.group(0)
+            start, end = match.span()
+            
+            # Skip if likely not PII (context-based filtering). Resume just
+            # after its start, so PII inside a rejected match is still found.
+            if is_false_positive(pii_type, original_value, text, start, text_lower):
+                pos = start + 1
+                continue
+            pos = end
+            
+            confidence = self._calculate_confidence(pii_type, original_value, text)
+            if min_confidence is not None and confidence < min_confidence:
+                continue
+            
+            value_hash = value_hashes.get(original_value)
+            if value_hash is None:
+                value_hash = hashlib.sha256(original_value.encode()).hexdigest()
+                value_hashes[original_value] = value_hash
+            
+            placeholder = self._generate_placeholder(pii_type, original_value, value_hash)
+            
+            detection = PIIDetection(
+                pii_type=pii_type,
+                original_value=original_value,
+                placeholder=placeholder,
+                start_pos=start,
+                end_pos=end,
+                confidence=confidence,
+                value_hash=value_hash
+            )
+            detections.append(detection)
         
+        # Already in text order, non-overlapping
         return detections
     
-    def _is_false_positive(self, pii_type: str, value: str, text: str, position: int) -> bool:
+    def _select_regex(self, text: str):
+        """
+        Choose the regex to scan text with.
+        
+        For ASCII text the RE2 pattern set finds which patterns occur at all;
+        the scan then only tries those (patterns that never match can't
+        change the leftmost match), and text with none is not scanned.
+        Other text must contain a digit, '@' or capitalized word to be
+        scanned, and an '@' for email patterns to be tried. bank_account
+        patterns are left out unless the text has banking context (see
+        BANK_CONTEXT_TERMS).
+        
+        Args:
+            text: Input text
+            
+        Returns:
+            Compiled regex, or None if no pattern can match
+        """
+        if self.PII_PATTERN_SET is None or not text.isascii():
+            has_at = '@' in text
+            if not (has_at or self.DIGIT_PATTERN.search(text) or self.CAPITALIZED_PATTERN.search(text)):
+                return None
+            present = frozenset(self.PII_GROUP_NAMES)
+            if not has_at:
+                present -= self.EMAIL_GROUP_NAMES
+        else:
+            present = frozenset(self.PII_GROUP_NAMES[i] for i in self.PII_PATTERN_SET(text))
+        
+        if not present.isdisjoint(self.BANK_GROUP_NAMES):
+            if not self._contains_bank_context(fold_case(text)):
+                present -= self.BANK_GROUP_NAMES
+        
+        if not present:
+            return None
+        if len(present) == len(self.PII_GROUP_NAMES):
+            return self.PII_REGEX
+        return _compile_pii_subset(present)
+    
+    def _is_false_positive(self, pii_type: str, value: str, text: str, position: int,
+                           text_lower: Optional[str] = None) -> bool:
         """
         Check if detected PII is likely a false positive.
         
@@ -193,6 +504,7 @@ class PIIRedactor:
             value: Detected value
             text: Full text
             position: Position in text
+            text_lower: text.lower(), if already computed and the same length
             
         Returns:
             True if likely false positive
@@ -200,37 +512,25 @@ class PIIRedactor:
         # Context-based filtering
         context_start = max(0, position - 50)
         context_end = min(len(text), position + len(value) + 50)
-        context = text[context_start:context_end].lower()
+        if text_lower is not None:
+            context = text_lower[context_start:context_end]
+        else:
+            context = text[context_start:context_end].lower()
         
         if pii_type == 'person_name':
-            # Skip common legal terms, entities, and section headers
-            skip_terms = [
-                # Legal terms
-                'supreme court', 'high court', 'civil appeal', 'criminal appeal',
-                'state of', 'union of', 'petitioner', 'respondent', 'appellant',
-                # Government entities
-                'state government', 'central government', 'union government',
-                'government of', 'ministry of',
-                # Common legal entities
-                'company', 'corporation', 'platform', 'limited', 'ltd',
-                'private limited', 'pvt ltd', 'public limited',
-                # Section headers
-                'legal issues', 'facts', 'arguments', 'case:', 'v.', 'vs.',
-                'background', 'issues', 'judgment', 'order', 'relief',
-                # Generic entities
-                'social media', 'bank', 'insurance', 'trust', 'society',
-            ]
-            
-            value_lower = value.lower()
+            if text_lower is not None:
+                value_lower = text_lower[position:position + len(value)]
+            else:
+                value_lower = value.lower()
             
             # Check if value itself is a skip term
-            if any(term in value_lower for term in skip_terms):
+            if self._contains_skip_term(value_lower):
                 return True
             
             # Check context
-            if any(term in context for term in skip_terms):
+            if self._contains_skip_term(context):
                 # But allow if preceded by "Justice", "Mr.", etc.
-                if not any(title in context for title in ['justice', 'mr.', 'mrs.', 'ms.', 'dr.']):
+                if not self._contains_title(context):
                     return True
             
             # Skip if it's all caps (likely an acronym or case name)
@@ -244,7 +544,7 @@ class PIIRedactor:
         
         elif pii_type == 'bank_account':
             # Skip if it's a year, case number, or section
-            if re.match(r'\b(19|20)\d{2}\b', value):  # Year
+            if self.YEAR_PATTERN.match(value):  # Year
                 return True
             if 'section' in context or 'case' in context:
                 return True
@@ -263,85 +563,105 @@ class PIIRedactor:
         Returns:
             Confidence score (0.0 to 1.0)
         """
-        base_confidence = {
-            'email': 0.95,  # Email regex is very reliable
-            'aadhaar': 0.90,  # Specific format
-            'pan': 0.95,  # Very specific format
-            'phone': 0.75,  # Can be confused with other numbers
-            'bank_account': 0.60,  # Often confused with case numbers
-            'person_name': 0.70,  # Name detection is tricky
-        }
-        
-        confidence = base_confidence.get(pii_type, 0.5)
+        confidence = self.BASE_CONFIDENCE.get(pii_type, 0.5)
         
         # Adjust based on context
         # (You can add more sophisticated confidence calculation here)
         
         return confidence
     
-    def redact(self, text: str, min_confidence: float = 0.7) -> Dict[str, Any]:
+    def redact(self, text: Union[str, bytes], min_confidence: float = 0.7, cache: bool = True) -> Dict[str, Any]:
         """
         Redact PII from text while maintaining context.
         
+        Results are cached by the SHA-256 of the text (which is computed for
+        the result anyway), so the same text redacted again across pipeline
+        stages isn't re-scanned. Only hashes and redacted text are cached.
+        
         Args:
-            text: Input text
+            text: Input text, or UTF-8 bytes (hashed as given, decoded once
+                for scanning; redacted_text is always str)
             min_confidence: Minimum confidence threshold for redaction
+            cache: Reuse the result for identical text
             
         Returns:
             Dictionary with redacted text and metadata
         """
-        # Reset counters for each redaction
-        self.counter = {k: 0 for k in self.counter.keys()}
+        # Generate original input hash
+        if isinstance(text, bytes):
+            original_hash = hashlib.sha256(text).hexdigest()
+            text = text.decode('utf-8')
+        else:
+            original_hash = hashlib.sha256(text.encode()).hexdigest()
+        
+        if not cache:
+            return self._redact_text(text, min_confidence, original_hash)
         
-        # Detect PII
-        detections = self._detect_pii(text)
+        cache_key = (original_hash, min_confidence)
+        cached = self.detection_cache.get(cache_key)
+        if cached is not None:
+            return _copy_redaction(cached)
         
-        # Filter by confidence
-        detections = [d for d in detections if d.confidence >= min_confidence]
+        result = self._redact_text(text, min_confidence, original_hash)
+        self.detection_cache.put(cache_key, result)
         
-        # Replace PII with placeholders
-        redacted_text = text
+        return _copy_redaction(result)
+    
+    def _redact_text(self, text: str, min_confidence: float, original_hash: str) -> Dict[str, Any]:
+        """Detect and replace PII in text (uncached path of redact)."""
+        # Reset counters for each redaction
+        self.counter = dict.fromkeys(self.PATTERNS, 0)
+        
+        # Detect PII above the confidence threshold
+        detections = self._detect_pii(text, min_confidence)
+        
+        # Replace PII with placeholders in one forward pass: collect the text
+        # between detections and the placeholders, then join once. The same
+        # pass collects the metadata.
+        parts = []
+        cursor = 0
         placeholder_map = {}
+        redaction_details = []
+        pii_types = set()
+        total_confidence = 0.0
         
         for detection in detections:
-            # Replace in text (already sorted in reverse order)
-            redacted_text = (
-                redacted_text[:detection.start_pos] + 
-                detection.placeholder + 
-                redacted_text[detection.end_pos:]
-            )
+            placeholder = detection.placeholder
+            pii_type = detection.pii_type
+            confidence = detection.confidence
+            
+            parts.append(text[cursor:detection.start_pos])
+            parts.append(placeholder)
+            cursor = detection.end_pos
             
             # Store mapping
-            placeholder_map[detection.placeholder] = {
-                'original_value_hash': hashlib.sha256(detection.original_value.encode()).hexdigest(),
-                'pii_type': detection.pii_type,
-                'confidence': detection.confidence
+            placeholder_map[placeholder] = {
+                'original_value_hash': detection.value_hash,
+                'pii_type': pii_type,
+                'confidence': confidence
             }
+            redaction_details.append({
+                'type': pii_type,
+                'placeholder': placeholder,
+                'confidence': round(confidence, 3)
+            })
+            pii_types.add(pii_type)
+            total_confidence += confidence
         
-        # Generate original input hash
-        original_hash = hashlib.sha256(text.encode()).hexdigest()
-        
-        # Prepare PII types detected
-        pii_types = list(set([d.pii_type for d in detections]))
+        parts.append(text[cursor:])
+        redacted_text = ''.join(parts)
         
         # Calculate overall confidence
-        avg_confidence = sum(d.confidence for d in detections) / len(detections) if detections else 1.0
+        avg_confidence = total_confidence / len(detections) if detections else 1.0
         
         return {
             'redacted_text': redacted_text,
             'original_input_hash': original_hash,
-            'pii_types_detected': pii_types,
+            'pii_types_detected': list(pii_types),
             'num_redactions': len(detections),
             'placeholder_map': placeholder_map,
             'redaction_confidence_score': round(avg_confidence, 3),
-            'redaction_details': [
-                {
-                    'type': d.pii_type,
-                    'placeholder': d.placeholder,
-                    'confidence': round(d.confidence, 3)
-                }
-                for d in detections
-            ]
+            'redaction_details': redaction_details
         }
     
     def unredact(self, redacted_text: str, placeholder_map: Dict[str, Dict]) -> str:
@@ -374,6 +694,29 @@ class PIIRedactor:
         Returns:
             PIIDetectionResult with redacted text and metadata
         """
+        return self.redact_with_compliance(text, case_id, user_id, backends=('vanta',))
+    
+    def redact_with_compliance(self,
+                               text: str,
+                               case_id: str = None,
+                               user_id: str = None,
+                               backends: Tuple[str, ...] = ('mcp', 'audit')) -> PIIDetectionResult:
+        """
+        Detect and redact PII once and log the result to each compliance backend.
+        
+        Args:
+            text: Input text to process
+            case_id: Optional case identifier for tracking
+            user_id: Optional user identifier for tracking
+            backends: Names from COMPLIANCE_BACKENDS, logged to in order
+            
+        Returns:
+            PIIDetectionResult with redacted text and metadata
+        """
+        unknown = [backend for backend in backends if backend not in self.COMPLIANCE_BACKENDS]
+        if unknown:
+            raise ValueError(f"Unknown compliance backends: {unknown}")
+        
         start_time = time.time()
         job_id = str(uuid.uuid4())
         
@@ -406,11 +749,32 @@ class PIIRedactor:
             timestamp=datetime.now(timezone.utc)
         )
         
-        # Log to Vanta if client is available
-        self._log_to_vanta(result, case_id, user_id)
+        for backend in backends:
+            getattr(self, self.COMPLIANCE_BACKENDS[backend])(result, case_id, user_id)
         
         return result
     
+    def _content_hashes(self, client, result: PIIDetectionResult) -> Tuple[str, str]:
+        """
+        Integrity hashes of the original and redacted text for a Vanta event.
+        
+        When the integrity hash is SHA-256, the original text's digest is the
+        one redact() already computed, so only the redacted text is hashed.
+        
+        Args:
+            client: Vanta client providing the hash helpers
+            result: Redaction result being logged
+            
+        Returns:
+            Tuple of (original hash, masked hash) as hex strings
+        """
+        from integrations import content_hash
+        
+        original_hash = result.redaction_metadata.get('original_input_hash')
+        if original_hash and content_hash.integrity_hash_algorithm() == 'SHA-256':
+            return original_hash, client.compute_content_hash(result.redacted_text)
+        return client.compute_pair_hashes(result.original_text, result.redacted_text)
+    
     def _log_to_vanta(self, result: PIIDetectionResult, case_id: str = None, user_id: str = None):
         """Log PII masking result to Vanta."""
         if not self.vanta_client:
@@ -436,9 +800,11 @@ class PIIRedactor:
             # Create PIIMaskingResult for Vanta
             from integrations.vanta_client import PIIMaskingResult
             
+            original_hash, masked_hash = self._content_hashes(self.vanta_client, result)
+            
             vanta_result = PIIMaskingResult(
-                original_content_hash=self.vanta_client.compute_content_hash(result.original_text),
-                masked_content_hash=self.vanta_client.compute_content_hash(result.redacted_text),
+                original_content_hash=original_hash,
+                masked_content_hash=masked_hash,
                 pii_types_detected=pii_types_detected,
                 pii_counts_before=pii_counts_before,
                 pii_counts_after=pii_counts_after,
@@ -470,6 +836,8 @@ class PIIRedactor:
         """
         Detect and redact PII with Vanta MCP compliance logging.
         
+        Also appends the result to the local audit trail.
+        
         Args:
             text: Input text to process
             case_id: Optional case identifier for tracking
@@ -478,45 +846,7 @@ class PIIRedactor:
         Returns:
             PIIDetectionResult with redacted text and metadata
         """
-        start_time = time.time()
-        job_id = str(uuid.uuid4())
-        
-        # Detect and redact PII using existing method
-        redaction_metadata = self.redact(text)
-        redacted_text = redaction_metadata.get('redacted_text', text)
-        
-        # Convert to PIIDetection objects
-        pii_detected = []
-        for pii_type in redaction_metadata.get('pii_types_detected', []):
-            pii_detected.append(PIIDetection(
-                pii_type=pii_type,
-                original_value='',  # Not stored in original format
-                placeholder=f'[{pii_type.upper()}_REDACTED]',
-                start_pos=0,
-                end_pos=0,
-                confidence=redaction_metadata.get('redaction_confidence_score', 0.9)
-            ))
-        
-        processing_time = int((time.time() - start_time) * 1000)
-        
-        result = PIIDetectionResult(
-            original_text=text,
-            redacted_text=redacted_text,
-            pii_detected=pii_detected,
-            redaction_confidence=redaction_metadata.get('redaction_confidence_score', 0.9),
-            redaction_metadata=redaction_metadata,
-            job_id=job_id,
-            processing_time_ms=processing_time,
-            timestamp=datetime.now(timezone.utc)
-        )
-        
-        # Log to Vanta MCP if client is available
-        self._log_to_vanta_mcp(result, case_id, user_id)
-        
-        # Log to local audit trail
-        self._log_to_audit_trail(result, case_id, user_id)
-        
-        return result
+        return self.redact_with_compliance(text, case_id, user_id, backends=('mcp', 'audit'))
     
     def _log_to_vanta_mcp(self, result: PIIDetectionResult, case_id: str = None, user_id: str = None):
         """Log PII masking result to Vanta via MCP server."""
@@ -544,9 +874,11 @@ class PIIRedactor:
             # Create PIIMaskingResult for Vanta MCP
             from integrations.vanta_mcp_client import PIIMaskingResult
             
+            original_hash, masked_hash = self._content_hashes(self.vanta_mcp_client, result)
+            
             vanta_result = PIIMaskingResult(
-                original_content_hash=self.vanta_mcp_client.compute_content_hash(result.original_text),
-                masked_content_hash=self.vanta_mcp_client.compute_content_hash(result.redacted_text),
+                original_content_hash=original_hash,
+                masked_content_hash=masked_hash,
                 pii_types_detected=pii_types_detected,
                 pii_counts_before=pii_counts_before,
                 pii_counts_after=pii_counts_after,
@@ -575,12 +907,6 @@ class PIIRedactor:
     def _log_to_audit_trail(self, result: PIIDetectionResult, case_id: str = None, user_id: str = None):
         """Log PII masking result to local audit trail."""
         try:
-            import os
-            import json
-            
-            # Ensure logs directory exists
-            os.makedirs('security/logs', exist_ok=True)
-            
             # Count PII types before and after
             pii_counts_before = {}
             pii_counts_after = {}
@@ -607,7 +933,7 @@ class PIIRedactor:
             
             # Create audit entry
             audit_entry = {
-                'timestamp': result.timestamp.isoformat(),
+                'timestamp': result.timestamp,
                 'event_type': 'PII_MASKING_JOB',
                 'job_id': result.job_id,
                 'case_id': case_id,
@@ -626,9 +952,7 @@ class PIIRedactor:
             }
             
             # Append to PII audit log
-            log_file = 'security/logs/pii_audit.log'
-            with open(log_file, 'a') as f:
-                f.write(json.dumps(audit_entry) + '\n')
+            _append_audit_line(PII_AUDIT_LOG, json_codec.dumps(audit_entry) + '\n')
             
             print(f"📝 PII audit entry logged: {result.job_id}")
                 
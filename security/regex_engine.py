@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Regex Engine Selection
+Compiles the security patterns with RE2 when google-re2 is installed.
+
+RE2 matches in linear time without backtracking, so patterns such as
+'<script[^>]*>.*?</script>' cannot be driven into catastrophic backtracking
+by crafted input. RE2's \\s, \\d, \\w and \\b are ASCII-only, though, so it
+only matches the same text as re on ASCII input; non-ASCII text is matched
+with re. Patterns RE2 cannot compile (lookaround, backreferences) and
+installs without google-re2 fall back to Python's re module entirely.
+"""
+
+import re
+import sys
+from typing import Callable, Iterable, List, Optional
+
+try:
+    import re2
+    RE2_AVAILABLE = True
+except ImportError:
+    RE2_AVAILABLE = False
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# Possessive quantifiers (a++, \s*+) need Python 3.11+; RE2 has none, but
+# never backtracks anyway
+POSSESSIVE_SUPPORTED = sys.version_info >= (3, 11)
+
+# After casefold(), Python's re still matches 'i' against the dotless i, and
+# the dotted capital I folds to 'i' + U+0307; normalize both so a
+# case-insensitive match always implies a literal match in the folded text.
+_FOLD_FIXUPS = {0x131: 'i', 0x307: None}
+
+# Python's \s on ASCII text; RE2's \s leaves out \v and \x1c-\x1f
+_PY_ASCII_SPACE = r'\t\n\x0b\x0c\r\x1c-\x1f '
+
+
+class _AsciiRE2Pattern:
+    """
+    Compiled pattern that runs RE2 on ASCII text and re on any other text.
+    
+    RE2 misses Unicode whitespace (e.g. a no-break space) for \\s and
+    Unicode digits for \\d, and doesn't fold the dotless i to 'i', so only
+    ASCII text is safe to hand to it.
+    """
+    
+    def __init__(self, pattern: str, re2_pattern, re_pattern):
+        self.pattern = pattern
+        self._re2 = re2_pattern
+        self._re = re_pattern
+    
+    def search(self, text: str, *args):
+        return (self._re2 if text.isascii() else self._re).search(text, *args)
+    
+    def match(self, text: str, *args):
+        return (self._re2 if text.isascii() else self._re).match(text, *args)
+    
+    def fullmatch(self, text: str, *args):
+        return (self._re2 if text.isascii() else self._re).fullmatch(text, *args)
+    
+    def finditer(self, text: str, *args):
+        return (self._re2 if text.isascii() else self._re).finditer(text, *args)
+    
+    def findall(self, text: str, *args):
+        return (self._re2 if text.isascii() else self._re).findall(text, *args)
+    
+    def __getattr__(self, name):
+        # groups, groupindex, flags, sub, ... come from the re pattern
+        return getattr(self._re, name)
+
+
+def compile_pattern(pattern: str, ignore_case: bool = True):
+    """
+    Compile a pattern with RE2 if possible, otherwise with re.
+    
+    Args:
+        pattern: Regular expression
+        ignore_case: Whether matching is case-insensitive
+        
+    Returns:
+        Compiled pattern exposing search/finditer/match like re.Pattern; with
+        RE2 it is only used for ASCII text, other text is matched with re
+    """
+    compiled = re.compile(pattern, re.IGNORECASE if ignore_case else 0)
+    if not RE2_AVAILABLE:
+        return compiled
+    
+    options = re2.Options()
+    options.case_sensitive = not ignore_case
+    options.log_errors = False
+    try:
+        fast = re2.compile(_with_python_ascii_space(pattern), options)
+    except re2.error:
+        return compiled  # Unsupported by RE2 - use the backtracking engine
+    return _AsciiRE2Pattern(pattern, fast, compiled)
+
+
+def compile_union(patterns: Iterable[str], ignore_case: bool = True):
+    """
+    Compile patterns into a single alternation that matches wherever any of them does.
+    
+    Args:
+        patterns: Regular expressions without inline flags
+        ignore_case: Whether matching is case-insensitive
+        
+    Returns:
+        Compiled pattern (see compile_pattern)
+    """
+    return compile_pattern('|'.join(f'(?:{p})' for p in patterns), ignore_case)
+
+
+def build_union_set(pattern_groups: Iterable[Iterable[str]],
+                    ignore_case: bool = True) -> Optional[Callable[[str], List[int]]]:
+    """
+    Build a single-pass check for which of several pattern groups occur in a text.
+    
+    Each group is added to an RE2 pattern set as the same alternation
+    compile_union builds, so a group is reported exactly when its
+    compile_union pattern would find a match. Like build_pattern_set this
+    only holds for ASCII text; callers must check text.isascii() first.
+    
+    Args:
+        pattern_groups: Groups of regular expressions without inline flags
+        ignore_case: Whether matching is case-insensitive
+        
+    Returns:
+        Function taking ASCII text and returning the indices of the groups
+        that match somewhere in it, or None if google-re2 is not installed
+        or a group is unsupported (compile_union then falls back to re as well)
+    """
+    if not RE2_AVAILABLE:
+        return None
+    
+    options = re2.Options()
+    options.case_sensitive = not ignore_case
+    options.log_errors = False
+    pattern_set = re2.Set.SearchSet(options)
+    try:
+        for patterns in pattern_groups:
+            pattern_set.Add(_with_python_ascii_space('|'.join(f'(?:{p})' for p in patterns)))
+        pattern_set.Compile()
+    except re2.error:
+        return None
+    
+    return lambda text: pattern_set.Match(text) or []
+
+
+def fold_case(text: str) -> str:
+    """Case-fold text for literal matching against lowercase ASCII literals."""
+    if text.isascii():
+        return text.lower()
+    return text.casefold().translate(_FOLD_FIXUPS)
+
+
+def build_literal_prefilter(literals: Iterable[str]) -> Callable[[str], bool]:
+    """
+    Build a check for whether case-folded text contains any of the literals.
+    
+    Uses a single Aho-Corasick pass when pyahocorasick is installed, otherwise
+    one search with a regex of the literals factored into a prefix trie.
+    
+    Args:
+        literals: Lowercase ASCII literals
+        
+    Returns:
+        Function taking folded text (see fold_case) and returning True on any hit
+    """
+    literals = tuple(dict.fromkeys(literals))
+    
+    if AHOCORASICK_AVAILABLE:
+        automaton = ahocorasick.Automaton()
+        for literal in literals:
+            automaton.add_word(literal, literal)
+        automaton.make_automaton()
+        return lambda folded: next(automaton.iter(folded), None) is not None
+    
+    if not literals:
+        return lambda folded: False
+    
+    search = re.compile(_literal_trie_pattern(literals)).search
+    return lambda folded: search(folded) is not None
+
+
+def _literal_trie_pattern(literals: Iterable[str]) -> str:
+    """
+    Build a regex matching any of the literals, with shared prefixes factored out.
+    
+    re tries alternatives one by one, so 'state of|state government' rescans
+    'state '; 'state (?:of|government)' doesn't. A literal that is a prefix
+    of another ends its branch, since matching the shorter one is enough.
+    """
+    trie = {}
+    for literal in literals:
+        node = trie
+        for char in literal:
+            node = node.setdefault(char, {})
+        node[''] = {}  # End of a literal
+    
+    def emit(node):
+        if '' in node:
+            return ''
+        branches = [re.escape(char) + emit(child) for char, child in node.items()]
+        if len(branches) == 1:
+            return branches[0]
+        return f"(?:{'|'.join(branches)})"
+    
+    return emit(trie)
+
+
+def strip_possessive(pattern: str) -> str:
+    """
+    Turn possessive quantifiers into plain greedy ones (a++ -> a+).
+    
+    For engines without possessive support. The greedy form matches
+    everywhere the possessive one does, and the same text wherever the
+    possessive quantifier is only there to skip futile backtracking.
+    
+    Args:
+        pattern: Regular expression
+        
+    Returns:
+        Pattern without possessive quantifiers
+    """
+    out = []
+    in_class = False
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == '\\':
+            out.append(pattern[i:i + 2])
+            i += 2
+            continue
+        if char == '[':
+            in_class = True
+        elif char == ']':
+            in_class = False
+        elif char == '+' and not in_class and out and out[-1] in ('+', '*', '?', '}'):
+            i += 1  # Drop the possessive marker
+            continue
+        out.append(char)
+        i += 1
+    return ''.join(out)
+
+
+def _with_python_ascii_space(pattern: str) -> str:
+    """Rewrite \\s so RE2 matches the same whitespace as re on ASCII text."""
+    out = []
+    in_class = False
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == '\\':
+            escape = pattern[i:i + 2]
+            if escape == r'\s':
+                escape = _PY_ASCII_SPACE if in_class else f'[{_PY_ASCII_SPACE}]'
+            out.append(escape)
+            i += 2
+            continue
+        if char == '[':
+            in_class = True
+        elif char == ']':
+            in_class = False
+        out.append(char)
+        i += 1
+    return ''.join(out)
+
+
+def build_pattern_set(patterns: Iterable[str]) -> Optional[Callable[[str], List[int]]]:
+    """
+    Build a single-pass check for which of several patterns occur in a text.
+    
+    Uses an RE2 pattern set, which scans the text once in a DFA regardless
+    of the number of patterns. RE2's \\d and \\b are ASCII-only, so results
+    match re only for ASCII text; callers must check text.isascii() first.
+    
+    Args:
+        patterns: Case-sensitive regular expressions (no lookaround;
+            possessive quantifiers are matched as greedy ones)
+        
+    Returns:
+        Function taking ASCII text and returning the indices of the patterns
+        that match somewhere in it, or None if google-re2 is not installed
+        or a pattern is unsupported
+    """
+    if not RE2_AVAILABLE:
+        return None
+    
+    options = re2.Options()
+    options.log_errors = False
+    pattern_set = re2.Set.SearchSet(options)
+    try:
+        for pattern in patterns:
+            pattern_set.Add(_with_python_ascii_space(strip_possessive(pattern)))
+        pattern_set.Compile()
+    except re2.error:
+        return None
+    
+    return lambda text: pattern_set.Match(text) or []
@@ -5,19 +5,102 @@ Backend enforcement layer that all requests must pass through.
 Combines input validation, PII redaction, and security logging.
 """
 
-import json
+import os
+import time
 import logging
-from datetime import datetime
+import itertools
+import operator
+import logging.handlers
 from typing import Dict, Any, Optional
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, fields
 
+from . import json_codec
 from .pii_redactor import PIIRedactor
 from .input_validator import InputValidator
 
+# Shared defaults for empty audit fields, so events without PII data or
+# violations don't build a fresh list/dict each time (both serialize as
+# empty JSON containers and are only read)
+_NO_ITEMS = ()
+_NO_PII_DATA = {}
+
+
+class _DeferredFlushFileHandler(logging.FileHandler):
+    """FileHandler that writes records without flushing; the caller flushes."""
+    
+    # File buffer sized for a whole batch of records (a few hundred bytes
+    # each), so a flush is a single write instead of one per 8KB
+    BUFFER_SIZE = 128 * 1024
+    
+    def _open(self):
+        return self._builtin_open(self.baseFilename, self.mode, buffering=self.BUFFER_SIZE,
+                                  encoding=self.encoding, errors=self.errors)
+    
+    def emit(self, record):
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+
+class _AuditFormatter(logging.Formatter):
+    """
+    '%(asctime)s - %(name)s - %(levelname)s - %(message)s' with fewer steps.
+    
+    The date and time are formatted once per second instead of per record,
+    and the line is built directly rather than through the %-style template.
+    """
+    
+    def __init__(self):
+        super().__init__('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+        self._asctime_second = (None, '')
+    
+    def formatTime(self, record, datefmt=None):
+        if datefmt is not None:
+            return super().formatTime(record, datefmt)
+        second = int(record.created)
+        cached_second, prefix = self._asctime_second
+        if second != cached_second:
+            prefix = time.strftime(self.default_time_format, self.converter(second))
+            self._asctime_second = (second, prefix)
+        return self.default_msec_format % (prefix, record.msecs)
+    
+    def format(self, record):
+        if record.exc_info or record.exc_text or record.stack_info:
+            return super().format(record)  # Tracebacks: the stock layout
+        record.message = record.getMessage()
+        record.asctime = self.formatTime(record)
+        return f"{record.asctime} - {record.name} - {record.levelname} - {record.message}"
+
+
+class _BatchedLogHandler(logging.handlers.MemoryHandler):
+    """
+    MemoryHandler that hands a flushed batch to its file in one flush.
+    
+    The stock MemoryHandler passes records to the target one by one, and a
+    FileHandler flushes after each, so batching alone saves no writes.
+    """
+    
+    def flush(self):
+        self.acquire()
+        try:
+            super().flush()
+            if self.target:
+                self.target.flush()
+        finally:
+            self.release()
+
 
 @dataclass
 class SecurityLog:
-    """Container for security audit logs."""
+    """
+    Container for security audit logs.
+    
+    Documents the audit entry layout; _log_security_event builds the same
+    fields as a plain dict, skipping asdict()'s recursive copy.
+    """
     timestamp: str
     request_id: str
     user_id: Optional[str]
@@ -32,8 +115,18 @@ class SecurityLog:
     ip_address: Optional[str] = None
     
     def to_dict(self) -> dict:
-        """Convert to dictionary."""
-        return asdict(self)
+        """
+        Convert to dictionary.
+        
+        Unlike asdict(), the list fields are shared rather than deep-copied;
+        a log entry is not modified once it has been written.
+        """
+        return dict(zip(_SECLOG_FIELDS, _SECLOG_GET(self)))
+
+
+# SecurityLog field names in declaration order, and a getter for all of them
+_SECLOG_FIELDS = tuple(f.name for f in fields(SecurityLog))
+_SECLOG_GET = operator.attrgetter(*_SECLOG_FIELDS)
 
 
 class SecurityEnforcer:
@@ -42,6 +135,10 @@ class SecurityEnforcer:
     All requests must pass through this layer before processing.
     """
     
+    # Audit records buffered before a write; warnings (failed validation)
+    # and anything above are written at once, as is the buffer at exit
+    LOG_BUFFER_CAPACITY = 256
+    
     def __init__(self, 
                  enable_pii_redaction: bool = True,
                  enable_validation: bool = True,
@@ -67,8 +164,16 @@ class SecurityEnforcer:
         # Setup logging
         self._setup_logging(log_file)
         
-        # Request counter for IDs
-        self.request_counter = 0
+        # Request numbers for IDs; next() on a count is atomic under the GIL,
+        # unlike += on an attribute, so concurrent requests never share one
+        self._request_numbers = itertools.count(1)
+        self._last_request_number = 0
+        
+        # (epoch second, its "%Y%m%d%H%M%S" local-time form) for request IDs
+        self._request_id_second = (None, '')
+        
+        # (epoch second, its "%Y-%m-%dT%H:%M:%S" local-time form) for log timestamps
+        self._timestamp_second = (None, '')
     
     def _setup_logging(self, log_file: str):
         """Setup security audit logging."""
@@ -76,29 +181,76 @@ class SecurityEnforcer:
         self.logger = logging.getLogger('LexiQ.Security')
         self.logger.setLevel(logging.INFO)
         
+        # The logger is process-wide; attach each log file only once so that
+        # creating enforcers per request doesn't leak handlers and file descriptors
+        log_path = os.path.abspath(log_file)
+        if any(getattr(getattr(handler, 'target', handler), 'baseFilename', None) == log_path
+               for handler in self.logger.handlers):
+            return
+        
         # Create file handler
         try:
-            import os
             os.makedirs(os.path.dirname(log_file), exist_ok=True)
-            file_handler = logging.FileHandler(log_file)
+            file_handler = _DeferredFlushFileHandler(log_file)
             file_handler.setLevel(logging.INFO)
             
             # Create formatter
-            formatter = logging.Formatter(
-                '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+            file_handler.setFormatter(_AuditFormatter())
+            
+            # Buffer records and write them in batches; logging.shutdown()
+            # at exit closes the handler, which writes what is left
+            batched_handler = _BatchedLogHandler(
+                capacity=self.LOG_BUFFER_CAPACITY,
+                flushLevel=logging.WARNING,
+                target=file_handler,
+                flushOnClose=True
             )
-            file_handler.setFormatter(formatter)
+            batched_handler.setLevel(logging.INFO)
             
             # Add handler
-            self.logger.addHandler(file_handler)
+            self.logger.addHandler(batched_handler)
         except Exception as e:
             print(f"Warning: Could not setup security logging: {e}")
     
+    @property
+    def request_counter(self) -> int:
+        """Number of request IDs issued (the latest number assigned)."""
+        return self._last_request_number
+    
     def _generate_request_id(self) -> str:
         """Generate unique request ID."""
-        self.request_counter += 1
-        timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-        return f"REQ_{timestamp}_{self.request_counter:06d}"
+        request_number = next(self._request_numbers)
+        self._last_request_number = request_number
+        
+        # Format the timestamp once per second rather than once per request
+        second = int(time.time())
+        cached_second, timestamp = self._request_id_second
+        if second != cached_second:
+            timestamp = time.strftime("%Y%m%d%H%M%S", time.localtime(second))
+            self._request_id_second = (second, timestamp)
+        
+        return f"REQ_{timestamp}_{request_number:06d}"
+    
+    def _timestamp(self) -> str:
+        """
+        Current local time in datetime.now().isoformat() form.
+        
+        Only the microseconds are formatted per call; the date and time up
+        to the second are formatted once per second.
+        
+        Returns:
+            ISO-8601 timestamp string
+        """
+        second, nanoseconds = divmod(time.time_ns(), 1_000_000_000)
+        cached_second, prefix = self._timestamp_second
+        if second != cached_second:
+            prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(second))
+            self._timestamp_second = (second, prefix)
+        
+        microseconds = nanoseconds // 1000
+        if microseconds:
+            return f"{prefix}.{microseconds:06d}"
+        return prefix  # isoformat() drops a zero fraction
     
     def process_case_input(self, 
                           case_text: str,
@@ -130,7 +282,7 @@ class SecurityEnforcer:
                     ip_address=ip_address,
                     action="INPUT_VALIDATION_FAILED",
                     original_input_hash=None,
-                    pii_data={},
+                    pii_data=_NO_PII_DATA,
                     validation_result=validation_result
                 )
                 
@@ -157,17 +309,41 @@ class SecurityEnforcer:
             processed_text = redaction_result['redacted_text']
         
         # Step 3: Log successful processing
+        original_input_hash = redaction_result['original_input_hash'] if redaction_result else None
         self._log_security_event(
             request_id=request_id,
             user_id=user_id,
             ip_address=ip_address,
             action="CASE_INPUT_PROCESSED",
-            original_input_hash=redaction_result['original_input_hash'] if redaction_result else None,
-            pii_data=redaction_result or {},
+            original_input_hash=original_input_hash,
+            pii_data=redaction_result or _NO_PII_DATA,
             validation_result=validation_result
         )
         
         # Return processed data
+        if validation_result:
+            validation_passed = validation_result.is_valid
+            risk_score = validation_result.risk_score
+        else:
+            validation_passed, risk_score = True, 0.0
+        
+        if redaction_result:
+            pii_metadata = {
+                'pii_detected': redaction_result['pii_types_detected'],
+                'num_redactions': redaction_result['num_redactions'],
+                'redaction_confidence': redaction_result['redaction_confidence_score'],
+                'original_input_hash': original_input_hash,
+                'placeholder_map': redaction_result.get('placeholder_map', {})
+            }
+        else:
+            pii_metadata = {
+                'pii_detected': [],
+                'num_redactions': 0,
+                'redaction_confidence': 1.0,
+                'original_input_hash': None,
+                'placeholder_map': {}
+            }
+        
         return {
             'success': True,
             'processed_text': processed_text,
@@ -175,13 +351,9 @@ class SecurityEnforcer:
             'processed_length': len(processed_text),
             'request_id': request_id,
             'security_metadata': {
-                'validation_passed': validation_result.is_valid if validation_result else True,
-                'risk_score': validation_result.risk_score if validation_result else 0.0,
-                'pii_detected': redaction_result['pii_types_detected'] if redaction_result else [],
-                'num_redactions': redaction_result['num_redactions'] if redaction_result else 0,
-                'redaction_confidence': redaction_result['redaction_confidence_score'] if redaction_result else 1.0,
-                'original_input_hash': redaction_result['original_input_hash'] if redaction_result else None,
-                'placeholder_map': redaction_result.get('placeholder_map', {}) if redaction_result else {}
+                'validation_passed': validation_passed,
+                'risk_score': risk_score,
+                **pii_metadata
             }
         }
     
@@ -251,6 +423,9 @@ class SecurityEnforcer:
         """
         Log security event to audit log.
         
+        Failed validations are logged as warnings, which are written out
+        immediately; other events are buffered (see LOG_BUFFER_CAPACITY).
+        
         Args:
             request_id: Request identifier
             user_id: User identifier
@@ -260,23 +435,27 @@ class SecurityEnforcer:
             pii_data: PII redaction data
             validation_result: Validation result
         """
-        log_entry = SecurityLog(
-            timestamp=datetime.now().isoformat(),
-            request_id=request_id,
-            user_id=user_id,
-            action=action,
-            original_input_hash=original_input_hash or "N/A",
-            pii_types_detected=pii_data.get('pii_types_detected', []),
-            num_redactions=pii_data.get('num_redactions', 0),
-            redaction_confidence_score=pii_data.get('redaction_confidence_score', 1.0),
-            validation_passed=validation_result.is_valid if validation_result else True,
-            risk_score=validation_result.risk_score if validation_result else 0.0,
-            violations=validation_result.violations if validation_result else [],
-            ip_address=ip_address
-        )
+        validation_passed = validation_result.is_valid if validation_result else True
+        
+        # Same fields, in the same order, as SecurityLog
+        log_entry = {
+            'timestamp': self._timestamp(),
+            'request_id': request_id,
+            'user_id': user_id,
+            'action': action,
+            'original_input_hash': original_input_hash or "N/A",
+            'pii_types_detected': pii_data.get('pii_types_detected', _NO_ITEMS),
+            'num_redactions': pii_data.get('num_redactions', 0),
+            'redaction_confidence_score': pii_data.get('redaction_confidence_score', 1.0),
+            'validation_passed': validation_passed,
+            'risk_score': validation_result.risk_score if validation_result else 0.0,
+            'violations': validation_result.violations if validation_result else _NO_ITEMS,
+            'ip_address': ip_address
+        }
         
         # Log to file
-        self.logger.info(json.dumps(log_entry.to_dict()))
+        level = logging.INFO if validation_passed else logging.WARNING
+        self.logger.log(level, json_codec.dumps(log_entry))
     
     def get_security_stats(self) -> Dict[str, Any]:
         """
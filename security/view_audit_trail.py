@@ -10,31 +10,165 @@ from datetime import datetime, timezone
 from typing import Dict, List, Any
 import sys
 
+try:
+    from . import json_codec
+except ImportError:  # Run as a script: python security/view_audit_trail.py
+    import json_codec
+
+# Logs shown by the viewer
+AUDIT_LOG_FILES = (
+    "security/logs/pii_audit.log",
+    "security/logs/security_audit.log",
+    "security/logs/hallucination_audit.log",
+)
+
+# Bytes read from the end of a log per step when looking for its last entries
+TAIL_CHUNK_BYTES = 64 * 1024
+
+def _parse_log_line(line: bytes):
+    """Parse one log line into an entry dict, or None if it holds no JSON object."""
+    # Handle non-JSON prefixes (like the logging module's timestamps)
+    start = line.find(b'{')
+    if start < 0:
+        return None
+    try:
+        return json_codec.loads(line[start:] if start else line)
+    except ValueError:
+        return None
+
 def load_json_logs(log_file: str) -> List[Dict[str, Any]]:
     """Load JSON log entries from a file."""
     entries = []
     if os.path.exists(log_file):
         try:
-            with open(log_file, 'r') as f:
-                for line in f:
-                    line = line.strip()
-                    if line:
-                        try:
-                            entry = json.loads(line)
-                            entries.append(entry)
-                        except json.JSONDecodeError:
-                            # Handle non-JSON lines (like timestamp prefixes)
-                            if '{' in line:
-                                json_part = line[line.find('{'):]
-                                try:
-                                    entry = json.loads(json_part)
-                                    entries.append(entry)
-                                except json.JSONDecodeError:
-                                    continue
+            # One read and a C-level split instead of iterating a text stream
+            with open(log_file, 'rb') as f:
+                for line in f.read().split(b'\n'):
+                    entry = _parse_log_line(line)
+                    if entry is not None:
+                        entries.append(entry)
         except Exception as e:
             print(f"Error reading {log_file}: {e}")
     return entries
 
+def tail_json_logs(log_file: str, n: int) -> List[Dict[str, Any]]:
+    """
+    Load the last n JSON log entries from a file, oldest first.
+    
+    Reads backwards from the end in TAIL_CHUNK_BYTES steps until n entries
+    are found, so the cost depends on n rather than on the log size.
+    """
+    entries = []
+    if n <= 0 or not os.path.exists(log_file):
+        return entries
+    try:
+        with open(log_file, 'rb') as f:
+            end = f.seek(0, os.SEEK_END)
+            start = end
+            while start > 0:
+                start = max(0, start - TAIL_CHUNK_BYTES)
+                f.seek(start)
+                lines = f.read(end - start).split(b'\n')
+                if start > 0:
+                    lines = lines[1:]  # Probably cut off mid-line
+                
+                # Parse from the newest line back, only as far as needed
+                entries = []
+                for line in reversed(lines):
+                    entry = _parse_log_line(line)
+                    if entry is not None:
+                        entries.append(entry)
+                        if len(entries) == n:
+                            break
+                if len(entries) == n:
+                    break
+    except Exception as e:
+        print(f"Error reading {log_file}: {e}")
+    entries.reverse()
+    return entries
+
+def _empty_counts() -> Dict[str, Any]:
+    """Counters kept for each log (see count_json_logs)."""
+    return {
+        'total': 0,
+        'passed': 0,  # compliance_status == 'PASS'
+        'suspected': 0,  # suspected_hallucination
+        'by_action': {},  # action -> events, in first-seen order
+    }
+
+def _counts_file(log_file: str) -> str:
+    """Sidecar file holding a log's counters, e.g. pii_audit.counts.json."""
+    return os.path.splitext(log_file)[0] + '.counts.json'
+
+def count_json_logs(log_file: str, rebuild: bool = False) -> Dict[str, Any]:
+    """
+    Count the entries of a JSON log, reading only what was appended since last time.
+    
+    Counters and the byte offset they cover are saved next to the log
+    (see _counts_file). Each call parses only complete lines past that
+    offset; the log is rescanned from the start if rebuild is set or the
+    file was replaced or truncated.
+    
+    Args:
+        log_file: Path to the log
+        rebuild: Ignore saved counters and scan the whole log
+        
+    Returns:
+        Dictionary with total, passed, suspected and by_action counts
+    """
+    if not os.path.exists(log_file):
+        return _empty_counts()
+    
+    counts_file = _counts_file(log_file)
+    stat = os.stat(log_file)
+    
+    saved = None
+    if not rebuild and os.path.exists(counts_file):
+        try:
+            with open(counts_file, 'r') as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            saved = None
+    if saved and saved.get('inode') == stat.st_ino and saved.get('offset', 0) <= stat.st_size:
+        counts, offset = saved['counts'], saved['offset']
+    else:
+        counts, offset = _empty_counts(), 0
+    
+    if offset < stat.st_size:
+        try:
+            with open(log_file, 'rb') as f:
+                f.seek(offset)
+                data = f.read(stat.st_size - offset)
+        except OSError as e:
+            print(f"Error reading {log_file}: {e}")
+            return counts
+        
+        # Leave a partly written last line for the next call
+        complete = data.rfind(b'\n') + 1
+        for line in data[:complete].split(b'\n'):
+            entry = _parse_log_line(line)
+            if entry is None:
+                continue
+            counts['total'] += 1
+            if entry.get('compliance_status') == 'PASS':
+                counts['passed'] += 1
+            if entry.get('suspected_hallucination', False):
+                counts['suspected'] += 1
+            action = entry.get('action', 'UNKNOWN')
+            counts['by_action'][action] = counts['by_action'].get(action, 0) + 1
+        offset += complete
+        
+        # Best effort: without a writable sidecar the next call rescans
+        try:
+            tmp_file = f"{counts_file}.tmp"
+            with open(tmp_file, 'w') as f:
+                json.dump({'inode': stat.st_ino, 'offset': offset, 'counts': counts}, f)
+            os.replace(tmp_file, counts_file)
+        except OSError:
+            pass
+    
+    return counts
+
 def format_timestamp(timestamp_str: str) -> str:
     """Format timestamp for display."""
     try:
@@ -52,17 +186,17 @@ def show_pii_audit_trail():
     print("=" * 60)
     
     pii_log_file = "security/logs/pii_audit.log"
-    entries = load_json_logs(pii_log_file)
+    counts = count_json_logs(pii_log_file)
     
-    if not entries:
+    if not counts['total']:
         print("📝 No PII audit entries found")
         print("💡 Run PII redaction to generate audit entries")
         return
     
-    print(f"📊 Total PII masking jobs: {len(entries)}")
+    print(f"📊 Total PII masking jobs: {counts['total']}")
     print()
     
-    for i, entry in enumerate(entries[-5:], 1):  # Show last 5 entries
+    for i, entry in enumerate(tail_json_logs(pii_log_file, 5), 1):  # Show last 5 entries
         print(f"📋 Job #{i}:")
         print(f"   🆔 Job ID: {entry.get('job_id', 'N/A')}")
         print(f"   ⏰ Timestamp: {format_timestamp(entry.get('timestamp', 'N/A'))}")
@@ -84,31 +218,24 @@ def show_security_audit_trail():
     print("=" * 60)
     
     security_log_file = "security/logs/security_audit.log"
-    entries = load_json_logs(security_log_file)
+    counts = count_json_logs(security_log_file)
     
-    if not entries:
+    if not counts['total']:
         print("📝 No security audit entries found")
         return
     
-    print(f"📊 Total security events: {len(entries)}")
+    print(f"📊 Total security events: {counts['total']}")
     print()
     
-    # Group by action type
-    actions = {}
-    for entry in entries:
-        action = entry.get('action', 'UNKNOWN')
-        if action not in actions:
-            actions[action] = 0
-        actions[action] += 1
-    
+    # Grouped by action type
     print("📈 Event Summary:")
-    for action, count in actions.items():
+    for action, count in counts['by_action'].items():
         print(f"   {action}: {count} events")
     print()
     
     # Show recent entries
     print("📋 Recent Events (last 3):")
-    for i, entry in enumerate(entries[-3:], 1):
+    for i, entry in enumerate(tail_json_logs(security_log_file, 3), 1):
         print(f"   {i}. {entry.get('action', 'N/A')} - {format_timestamp(entry.get('timestamp', 'N/A'))}")
         if 'pii_types_detected' in entry:
             print(f"      PII: {', '.join(entry.get('pii_types_detected', []))}")
@@ -122,22 +249,19 @@ def show_hallucination_audit_trail():
     print("=" * 60)
     
     hallucination_log_file = "security/logs/hallucination_audit.log"
-    entries = load_json_logs(hallucination_log_file)
+    counts = count_json_logs(hallucination_log_file)
     
-    if not entries:
+    if not counts['total']:
         print("📝 No hallucination detection entries found")
         return
     
-    print(f"📊 Total hallucination checks: {len(entries)}")
-    
-    # Count suspected hallucinations
-    suspected_count = sum(1 for entry in entries if entry.get('suspected_hallucination', False))
-    print(f"⚠️  Suspected hallucinations: {suspected_count}")
+    print(f"📊 Total hallucination checks: {counts['total']}")
+    print(f"⚠️  Suspected hallucinations: {counts['suspected']}")
     print()
     
     # Show recent entries
     print("📋 Recent Hallucination Checks (last 3):")
-    for i, entry in enumerate(entries[-3:], 1):
+    for i, entry in enumerate(tail_json_logs(hallucination_log_file, 3), 1):
         suspected = entry.get('suspected_hallucination', False)
         confidence = entry.get('confidence_score', 'N/A')
         num_suspected = entry.get('num_suspected', 0)
@@ -186,24 +310,22 @@ def show_compliance_summary():
     print("📊 COMPLIANCE SUMMARY")
     print("=" * 60)
     
-    # Load all logs
-    pii_entries = load_json_logs("security/logs/pii_audit.log")
-    security_entries = load_json_logs("security/logs/security_audit.log")
-    hallucination_entries = load_json_logs("security/logs/hallucination_audit.log")
+    # Count all logs
+    pii_counts = count_json_logs("security/logs/pii_audit.log")
+    security_counts = count_json_logs("security/logs/security_audit.log")
+    hallucination_counts = count_json_logs("security/logs/hallucination_audit.log")
     
-    print(f"📋 PII Masking Jobs: {len(pii_entries)}")
-    if pii_entries:
-        pass_count = sum(1 for entry in pii_entries if entry.get('compliance_status') == 'PASS')
-        print(f"   ✅ Passed: {pass_count}")
-        print(f"   ❌ Failed: {len(pii_entries) - pass_count}")
+    print(f"📋 PII Masking Jobs: {pii_counts['total']}")
+    if pii_counts['total']:
+        print(f"   ✅ Passed: {pii_counts['passed']}")
+        print(f"   ❌ Failed: {pii_counts['total'] - pii_counts['passed']}")
     
-    print(f"🛡️  Security Events: {len(security_entries)}")
+    print(f"🛡️  Security Events: {security_counts['total']}")
     
-    print(f"🧠 Hallucination Checks: {len(hallucination_entries)}")
-    if hallucination_entries:
-        suspected_count = sum(1 for entry in hallucination_entries if entry.get('suspected_hallucination', False))
-        print(f"   🚨 Suspected: {suspected_count}")
-        print(f"   ✅ Clean: {len(hallucination_entries) - suspected_count}")
+    print(f"🧠 Hallucination Checks: {hallucination_counts['total']}")
+    if hallucination_counts['total']:
+        print(f"   🚨 Suspected: {hallucination_counts['suspected']}")
+        print(f"   ✅ Clean: {hallucination_counts['total'] - hallucination_counts['suspected']}")
     
     print()
     print("🎯 Overall Status: ✅ COMPLIANCE MONITORING ACTIVE")
@@ -224,6 +346,11 @@ def main():
         print("💡 Run security tests to generate audit logs")
         return
     
+    # Rescan the logs instead of continuing from the saved counters
+    if '--rebuild-counters' in sys.argv[1:]:
+        for log_file in AUDIT_LOG_FILES:
+            count_json_logs(log_file, rebuild=True)
+    
     show_compliance_summary()
     print()
     show_pii_audit_trail()
@@ -3,9 +3,19 @@
 Test script for LexiQ Case Similarity Analyzer.
 """
 
+from functools import lru_cache
+
 from utils.case_similarity import CaseSimilarityAnalyzer
 
 
+@lru_cache(maxsize=1)
+def _get_analyzer() -> CaseSimilarityAnalyzer:
+    """Initialize the analyzer once; every test shares its loaded vector store."""
+    analyzer = CaseSimilarityAnalyzer(vector_store_dir="data/vector_store")
+    analyzer.initialize()
+    return analyzer
+
+
 def test_text_analysis():
     """Test case analysis from text description."""
     
@@ -14,9 +24,8 @@ def test_text_analysis():
     print("=" * 70)
     print()
     
-    # Initialize analyzer
-    analyzer = CaseSimilarityAnalyzer(vector_store_dir="data/vector_store")
-    analyzer.initialize()
+    # Initialize analyzer (shared across tests)
+    analyzer = _get_analyzer()
     
     # Sample case description
     sample_case = """
@@ -82,9 +91,8 @@ def test_quick_search():
     print("=" * 70)
     print()
     
-    # Initialize analyzer
-    analyzer = CaseSimilarityAnalyzer(vector_store_dir="data/vector_store")
-    analyzer.initialize()
+    # Initialize analyzer (shared across tests)
+    analyzer = _get_analyzer()
     
     # Search query
     search_text = "freedom of speech and reasonable restrictions"
@@ -113,6 +121,18 @@ def test_quick_search():
         print(f"   Section: {case.get('section', 'N/A')}")
         print(f"   Preview: {case['content_preview'][:200]}...")
         print()
+    
+    # Repeat the search: served from the analyzer's query cache
+    repeat_cases = analyzer.find_similar_cases_only(
+        case_text=search_text,
+        k=5,
+        with_scores=True
+    )
+    assert repeat_cases == similar_cases
+    
+    stats = analyzer.get_cache_stats()
+    print(f"Query cache: {stats['hits']} hits, {stats['misses']} misses "
+          f"(hit rate {stats['hit_rate']:.0%})")
 
 
 def test_pdf_analysis():
@@ -132,9 +152,8 @@ def test_pdf_analysis():
         print("Skipping PDF analysis test.")
         return
     
-    # Initialize analyzer
-    analyzer = CaseSimilarityAnalyzer(vector_store_dir="data/vector_store")
-    analyzer.initialize()
+    # Initialize analyzer (shared across tests)
+    analyzer = _get_analyzer()
     
     # Analyze PDF
     result = analyzer.analyze_case_from_pdf(test_pdf, k=3)
@@ -103,6 +103,22 @@ if result5['security_metadata']['num_redactions'] == 0:
 else:
     print(f"   ❌ FAIL: Headers flagged as PII")
 
+# Test 6: Values matched by several patterns (one placeholder each, no corruption)
+print("\n6. OVERLAPPING PATTERNS (each value replaced exactly once):")
+print("-" * 80)
+case6 = """The complainant Mr. Rajesh Kumar shared Aadhaar 123456789012.
+He can be reached at 9876543210@ybl.in for the hearing."""
+
+result6 = enforcer.process_case_input(case6, "user6")
+processed6 = result6['processed_text']
+print(f"   Processed: {processed6}")
+print(f"   Redactions: {result6['security_metadata']['num_redactions']}")
+if (processed6.count('[') == processed6.count(']') == result6['security_metadata']['num_redactions']
+        and '123456789012' not in processed6 and '@ybl.in' not in processed6):
+    print(f"   ✅ PASS: Overlapping matches redacted cleanly")
+else:
+    print(f"   ❌ FAIL: Overlapping matches corrupted the text")
+
 print("\n" + "=" * 80)
 print("SUMMARY")
 print("=" * 80)
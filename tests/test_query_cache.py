@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Query Cache Test
+Tests the LRU/TTL cache shared by the result caches
+"""
+
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from utils.query_cache import QueryCache
+
+
+def test_lru_eviction():
+    """Test that the least recently used entry is evicted first."""
+    print("=" * 80)
+    print("TEST: LRU Eviction")
+    print("=" * 80)
+    
+    cache = QueryCache(max_size=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    cache.get('a')  # 'b' is now least recently used
+    cache.put('c', 3)
+    
+    assert cache.get('b') is None
+    assert cache.get('a') == 1 and cache.get('c') == 3
+    assert len(cache) == 2
+    print("✅ Least recently used entry evicted\n")
+
+
+def test_expiry():
+    """Test default and per-entry lifetimes."""
+    print("=" * 80)
+    print("TEST: Entry Expiry")
+    print("=" * 80)
+    
+    cache = QueryCache(max_size=10, ttl=0.05)
+    cache.put('default', 1)
+    cache.put('long', 2, ttl=60)
+    cache.put('expired', 3, ttl=-1)
+    
+    assert cache.get('expired') is None
+    time.sleep(0.1)
+    assert cache.get('default') is None
+    assert cache.get('long') == 2
+    assert len(cache) == 1
+    print("✅ Expired entries dropped, others kept\n")
+
+
+def test_stats_pop_and_clear():
+    """Test hit/miss statistics, pop and clear."""
+    print("=" * 80)
+    print("TEST: Statistics, Pop and Clear")
+    print("=" * 80)
+    
+    cache = QueryCache(max_size=10, ttl=300)
+    cache.put('a', 1)
+    cache.get('a')
+    cache.get('missing')
+    
+    stats = cache.stats()
+    print(f"Stats: {stats}")
+    assert stats == {
+        'size': 1,
+        'max_size': 10,
+        'ttl_seconds': 300,
+        'hits': 1,
+        'misses': 1,
+        'hit_rate': 0.5
+    }
+    
+    cache.pop('a')
+    cache.pop('a')  # Missing keys are ignored
+    assert cache.get('a') is None
+    
+    cache.put('b', 2)
+    cache.clear()
+    assert len(cache) == 0
+    print("✅ Statistics, pop and clear behave as documented\n")
+
+
+if __name__ == "__main__":
+    test_lru_eviction()
+    test_expiry()
+    test_stats_pop_and_clear()
+    print("🎉 Query cache tests complete!")
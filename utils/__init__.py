@@ -1,23 +1,29 @@
 """
 Utils package for LexIQ - Legal Document Processing
+
+The classes below are imported on first access, so lightweight helpers such
+as utils.query_cache can be used without loading LangChain and AWS clients.
 """
 
-from .pdf_parser import LegalPDFParser
-from .s3_uploader import S3Uploader
-from .text_chunker import LegalTextChunker
-from .vector_store import VectorStoreManager
-from .pipeline import DocumentProcessingPipeline
-from .retriever import LegalDocumentRetriever
-from .query_handler import QueryHandler
-from .case_similarity import CaseSimilarityAnalyzer
+import importlib
+
+# Exported name -> submodule defining it
+_EXPORTS = {
+    "LegalPDFParser": ".pdf_parser",
+    "S3Uploader": ".s3_uploader",
+    "LegalTextChunker": ".text_chunker",
+    "VectorStoreManager": ".vector_store",
+    "DocumentProcessingPipeline": ".pipeline",
+    "LegalDocumentRetriever": ".retriever",
+    "QueryHandler": ".query_handler",
+    "CaseSimilarityAnalyzer": ".case_similarity",
+}
+
+__all__ = list(_EXPORTS)
+
 
-__all__ = [
-    "LegalPDFParser",
-    "S3Uploader",
-    "LegalTextChunker",
-    "VectorStoreManager",
-    "DocumentProcessingPipeline",
-    "LegalDocumentRetriever",
-    "QueryHandler",
-    "CaseSimilarityAnalyzer",
-]
+def __getattr__(name):
+    """Import an exported class from its submodule when first accessed."""
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
@@ -4,14 +4,16 @@ Finds similar precedents for a lawyer's current case.
 """
 
 import os
+import hashlib
 import tempfile
-from typing import List, Dict, Any, Union
+from typing import List, Dict, Any, Union, Optional
 from langchain.docstore.document import Document
 from langchain_aws import BedrockEmbeddings
 
 from .retriever import LegalDocumentRetriever
 from .pdf_parser import LegalPDFParser
 from .text_chunker import LegalTextChunker
+from .query_cache import QueryCache
 from aws.bedrock_client import call_claude
 
 
@@ -80,6 +82,10 @@ FORMAT YOUR RESPONSE IN MARKDOWN:
 class CaseSimilarityAnalyzer:
     """Analyzes lawyer's current case and finds similar precedents."""
     
+    # find_similar_cases_only results kept for repeated queries
+    QUERY_CACHE_MAX_ENTRIES = 2000
+    QUERY_CACHE_TTL_SECONDS = 300
+    
     def __init__(self, vector_store_dir: str = "data/vector_store"):
         """
         Initialize the case similarity analyzer.
@@ -93,10 +99,15 @@ class CaseSimilarityAnalyzer:
         self.chunker = LegalTextChunker(embeddings=self.embeddings, max_chunk_size=2000)
         self.is_initialized = False
         
+        # Similar-case results by query key; repeat queries skip the
+        # embedding call and index search
+        self._query_cache = QueryCache(self.QUERY_CACHE_MAX_ENTRIES, self.QUERY_CACHE_TTL_SECONDS)
+        
     def initialize(self):
         """Load the vector store."""
         print("Initializing Case Similarity Analyzer...")
         self.retriever.load_vector_store()
+        self.clear_query_cache()  # Results from a previous store are stale
         self.is_initialized = True
         print("✓ Analyzer ready!\n")
         
@@ -105,16 +116,21 @@ class CaseSimilarityAnalyzer:
         case_description: str, 
         k: int = 5,
         max_tokens: int = 2000,
-        temperature: float = 0.3
+        temperature: float = 0.3,
+        threshold: Optional[float] = None,
+        max_results: int = 20
     ) -> Dict[str, Any]:
         """
         Analyze a case from text description.
         
         Args:
             case_description: Text description of the current case
-            k: Number of similar cases to retrieve
+            k: Number of similar cases to retrieve (the minimum when threshold is set)
             max_tokens: Max tokens for Claude response
             temperature: Sampling temperature
+            threshold: If set, retrieve every precedent within this distance
+                instead of a fixed k
+            max_results: Maximum precedents to retrieve when threshold is set
             
         Returns:
             Dictionary with analysis and similar cases
@@ -126,9 +142,60 @@ class CaseSimilarityAnalyzer:
         print(f"📝 Case description length: {len(case_description)} characters")
         
         # Retrieve similar cases from vector store
-        similar_cases = self.retriever.retrieve(case_description, k=k)
+        if threshold is None:
+            similar_cases = self.retriever.retrieve(case_description, k=k)
+        else:
+            results = self.retriever.retrieve_within_threshold(
+                case_description,
+                threshold=threshold,
+                min_results=k,
+                max_results=max_results
+            )
+            similar_cases = [doc for doc, _ in results]
         print(f"✓ Found {len(similar_cases)} similar precedents")
         
+        return self._analyze_with_precedents(
+            case_description, similar_cases, max_tokens, temperature
+        )
+    
+    def analyze_cases_from_texts(
+        self,
+        case_descriptions: List[str],
+        k: int = 5,
+        max_tokens: int = 2000,
+        temperature: float = 0.3
+    ) -> List[Dict[str, Any]]:
+        """
+        Analyze several cases, retrieving precedents for all of them at once.
+        
+        Args:
+            case_descriptions: Text descriptions of the cases
+            k: Number of similar cases to retrieve per case
+            max_tokens: Max tokens for each Claude response
+            temperature: Sampling temperature
+            
+        Returns:
+            List of analysis dictionaries, one per case in the same order
+        """
+        if not self.is_initialized:
+            raise ValueError("Analyzer not initialized. Call initialize() first.")
+        
+        print(f"🔍 Finding similar precedents for {len(case_descriptions)} cases...")
+        batch_cases = self.retriever.retrieve_batch(case_descriptions, k=k)
+        
+        return [
+            self._analyze_with_precedents(case_description, similar_cases, max_tokens, temperature)
+            for case_description, similar_cases in zip(case_descriptions, batch_cases)
+        ]
+    
+    def _analyze_with_precedents(
+        self,
+        case_description: str,
+        similar_cases: List[Document],
+        max_tokens: int,
+        temperature: float
+    ) -> Dict[str, Any]:
+        """Generate the Claude analysis for a case and its retrieved precedents."""
         # Format the retrieved precedents
         precedents_context = self.retriever.format_retrieved_docs(similar_cases)
         
@@ -232,6 +299,41 @@ Full Text:
         
         print(f"🔍 Finding {k} similar {'cases' if deduplicate else 'chunks'}...")
         
+        cache_key = (
+            hashlib.blake2b(case_text.encode('utf-8'), digest_size=16).digest(),
+            k, with_scores, deduplicate
+        )
+        cached = self._query_cache.get(cache_key)
+        if cached is not None:
+            print(f"✓ Found {len(cached)} {'unique cases' if deduplicate else 'chunks'} (cached)")
+            return [dict(case_info) for case_info in cached]
+        
+        similar_cases = self._find_similar_cases(case_text, k, with_scores, deduplicate)
+        self._query_cache.put(cache_key, similar_cases)
+        
+        return [dict(case_info) for case_info in similar_cases]
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """
+        Get find_similar_cases_only cache statistics.
+        
+        Returns:
+            Dictionary with cache size, hits, misses and hit rate
+        """
+        return self._query_cache.stats()
+    
+    def clear_query_cache(self):
+        """Drop all cached find_similar_cases_only results."""
+        self._query_cache.clear()
+    
+    def _find_similar_cases(
+        self,
+        case_text: str,
+        k: int,
+        with_scores: bool,
+        deduplicate: bool
+    ) -> List[Dict[str, Any]]:
+        """Run the search behind find_similar_cases_only (see there)."""
         if deduplicate:
             # Retrieve more chunks to ensure we get k unique cases
             # (since multiple chunks may be from the same case)
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Query Cache
+Thread-safe LRU cache with optional expiry, shared by the result caches
+(PII redaction, hallucination checks, JWT decoding, similar-case search).
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+
+class QueryCache:
+    """
+    Least-recently-used cache whose entries can expire.
+    
+    Entries expire ttl seconds after they are stored (never, if ttl is
+    None); expired entries are dropped when next looked up. Values are
+    returned as stored, so callers caching mutable results should hand out
+    copies.
+    """
+    
+    def __init__(self, max_size: int, ttl: Optional[float] = None):
+        """
+        Initialize the cache.
+        
+        Args:
+            max_size: Maximum number of entries; the least recently used
+                are evicted beyond it
+            ttl: Default lifetime of an entry in seconds (None: no expiry)
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        
+        # key -> (monotonic expiry deadline or None, value), LRU first
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Look up a value, marking it as recently used.
+        
+        Args:
+            key: Cache key
+        
+        Returns:
+            The cached value, or None if it is missing or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at is None or time.monotonic() < expires_at:
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return value
+                del self._entries[key]
+            self._misses += 1
+            return None
+    
+    def put(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """
+        Store a value, evicting the least recently used entries beyond max_size.
+        
+        Args:
+            key: Cache key
+            value: Value to cache (not None)
+            ttl: Lifetime in seconds for this entry, overriding the default
+        """
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = None if ttl is None else time.monotonic() + ttl
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+    
+    def pop(self, key: Hashable):
+        """Drop an entry if it is cached."""
+        with self._lock:
+            self._entries.pop(key, None)
+    
+    def clear(self):
+        """Drop all entries."""
+        with self._lock:
+            self._entries.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+        
+        Returns:
+            Dictionary with cache size, limits, hits, misses and hit rate
+        """
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'ttl_seconds': self.ttl,
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_rate': self._hits / lookups if lookups else 0.0
+            }
+    
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -4,6 +4,7 @@ Handles semantic search and document retrieval from the vector store.
 """
 
 from typing import List, Dict, Any
+import numpy as np
 from langchain.docstore.document import Document
 from langchain_aws import BedrockEmbeddings
 from .vector_store import VectorStoreManager
@@ -64,6 +65,84 @@ class LegalDocumentRetriever:
         results = self.vector_store.similarity_search_with_score(query, k=k)
         return results
     
+    def retrieve_within_threshold(
+        self,
+        query: str,
+        threshold: float,
+        min_results: int = 3,
+        max_results: int = 20
+    ) -> List[tuple[Document, float]]:
+        """
+        Retrieve every document within a distance threshold of the query.
+        
+        Uses a FAISS range search, so the number of results follows the
+        number of genuinely close chunks instead of a fixed k. If fewer than
+        min_results chunks fall inside the threshold, the nearest min_results
+        are returned instead.
+        
+        Args:
+            query: User's search query
+            threshold: Maximum distance (same metric as retrieve_with_scores)
+            min_results: Minimum number of documents to return
+            max_results: Maximum number of documents to return
+            
+        Returns:
+            List of tuples (Document, score), closest first
+        """
+        if self.vector_store is None:
+            raise ValueError("Vector store not loaded. Call load_vector_store() first.")
+        
+        # Embed once and reuse the vector for the top-up search
+        embedding = self.vector_store_manager.embeddings.embed_query(query)
+        query_vector = np.asarray([embedding], dtype=np.float32)
+        
+        lims, distances, indices = self.vector_store.index.range_search(query_vector, threshold)
+        hits = sorted(zip(distances[lims[0]:lims[1]], indices[lims[0]:lims[1]]))
+        
+        if len(hits) < min_results:
+            # The nearest min_results always contain every in-range hit
+            return self.vector_store.similarity_search_with_score_by_vector(
+                embedding, k=min_results
+            )
+        
+        return [(self._get_document(index_id), float(distance)) for distance, index_id in hits[:max_results]]
+    
+    def retrieve_batch(self, queries: List[str], k: int = 5) -> List[List[Document]]:
+        """
+        Retrieve the top-k documents for several queries in one index search.
+        
+        All queries are embedded together and searched as a single matrix,
+        so the index is scanned once for the whole batch.
+        
+        Args:
+            queries: List of search queries
+            k: Number of documents to retrieve per query
+            
+        Returns:
+            List of Document lists, one per query in the same order
+        """
+        if self.vector_store is None:
+            raise ValueError("Vector store not loaded. Call load_vector_store() first.")
+        
+        if not queries:
+            return []
+        
+        embeddings = self.vector_store_manager.embeddings.embed_documents(queries)
+        query_matrix = np.asarray(embeddings, dtype=np.float32)
+        
+        _, indices = self.vector_store.index.search(query_matrix, k)
+        
+        # FAISS pads rows with -1 when the store holds fewer than k vectors
+        return [
+            [self._get_document(index_id) for index_id in row if index_id != -1]
+            for row in indices
+        ]
+    
+    def _get_document(self, index_id: int) -> Document:
+        """Look up the Document stored at a FAISS index position."""
+        doc_id = self.vector_store.index_to_docstore_id[int(index_id)]
+        return self.vector_store.docstore.search(doc_id)
+    
     def format_retrieved_docs(self, documents: List[Document]) -> str:
         """
         Format retrieved documents into a readable context string.